@@ -5,7 +5,7 @@
 # Heavy logic lives in supervisor/ package.
 
 import logging
-import os, sys, json, time, uuid, pathlib, subprocess, datetime, threading, queue as _queue_mod
+import os, sys, json, time, uuid, pathlib, subprocess, datetime, threading
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 log = logging.getLogger(__name__)
@@ -218,7 +218,7 @@ from supervisor.queue import (
 )
 
 from supervisor.workers import (
-    init as workers_init, get_event_q, WORKERS, PENDING, RUNNING,
+    init as workers_init, get_event_q, drain_events, WORKERS, PENDING, RUNNING,
     spawn_workers, kill_workers, assign_tasks, ensure_workers_healthy,
     handle_chat_direct, _get_chat_agent, auto_resume_after_restart,
 )
@@ -478,6 +478,10 @@ offset = int(load_state().get("tg_offset") or 0)
 _last_diag_heartbeat_ts = 0.0
 _last_message_ts: float = time.time()  # Start in active mode after restart
 _ACTIVE_MODE_SEC: int = 300  # 5 min of activity = active polling mode
+# Chat log rotation is a size check on Drive; the log grows slowly, so once
+# a minute is plenty instead of every tick.
+_CHAT_ROTATE_CHECK_SEC: float = 60.0
+_next_chat_rotate_check: float = 0.0
 
 # Auto-start background consciousness (creator's policy: always on by default)
 try:
@@ -488,16 +492,14 @@ except Exception as e:
 
 while True:
     loop_started_ts = time.time()
-    rotate_chat_log_if_needed(DRIVE_ROOT)
+    if time.monotonic() >= _next_chat_rotate_check:
+        rotate_chat_log_if_needed(DRIVE_ROOT)
+        _next_chat_rotate_check = time.monotonic() + _CHAT_ROTATE_CHECK_SEC
     ensure_workers_healthy()
 
     # Drain worker events
     event_q = get_event_q()
-    while True:
-        try:
-            evt = event_q.get_nowait()
-        except _queue_mod.Empty:
-            break
+    for evt in drain_events():
         dispatch_event(evt, _event_ctx)
 
     enforce_task_timeouts()
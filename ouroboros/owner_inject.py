@@ -9,22 +9,82 @@ The supervisor does NOT write here directly. Only the LLM (via
 forward_to_worker tool) writes to a task's mailbox. Workers drain
 messages for their own task_id on each LLM round.
 """
+import atexit
 import datetime
-import json
 import logging
+import os
 import pathlib
+import threading
 import uuid
-from typing import List, Optional
+from collections import OrderedDict
+from typing import BinaryIO, List, Optional
+
+from ouroboros.utils import ensure_dir, forget_dir, json_dumpb, json_loads
 
 log = logging.getLogger(__name__)
 
 _MAILBOX_DIR = "memory/owner_mailbox"
 
+# Persistent append handles per mailbox file, oldest closed first.
+_MAX_HANDLES = 8
+_HANDLES: "OrderedDict[pathlib.Path, BinaryIO]" = OrderedDict()
+_HANDLES_LOCK = threading.Lock()
+
 
 def _mailbox_path(drive_root: pathlib.Path, task_id: str) -> pathlib.Path:
     return drive_root / _MAILBOX_DIR / f"{task_id}.jsonl"
 
 
+def _append_line(path: pathlib.Path, data: bytes) -> None:
+    """Append to a mailbox through a cached handle; flushed so readers see it."""
+    with _HANDLES_LOCK:
+        f = _HANDLES.get(path)
+        if f is None:
+            f = path.open("ab")
+            _HANDLES[path] = f
+            while len(_HANDLES) > _MAX_HANDLES:
+                _, oldest = _HANDLES.popitem(last=False)
+                oldest.close()
+        else:
+            _HANDLES.move_to_end(path)
+        try:
+            f.write(data)
+            f.flush()
+        except Exception:
+            _HANDLES.pop(path, None)
+            f.close()
+            raise
+
+
+def _close_handle(path: pathlib.Path) -> None:
+    with _HANDLES_LOCK:
+        f = _HANDLES.pop(path, None)
+    if f is not None:
+        f.close()
+
+
+@atexit.register
+def _close_all_handles() -> None:
+    with _HANDLES_LOCK:
+        handles = list(_HANDLES.values())
+        _HANDLES.clear()
+    for f in handles:
+        try:
+            f.close()
+        except Exception:
+            log.debug("Failed to close mailbox handle", exc_info=True)
+
+
+def _reset_after_fork() -> None:
+    global _HANDLES_LOCK
+    _HANDLES_LOCK = threading.Lock()
+    _HANDLES.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 def get_pending_path(drive_root: pathlib.Path) -> pathlib.Path:
     """Legacy compat: path to old global pending file (for cleanup on startup)."""
     return drive_root / "memory/owner_messages_pending.jsonl"
@@ -38,16 +98,16 @@ def write_owner_message(
 ) -> None:
     """Write an owner message to a specific task's mailbox."""
     path = _mailbox_path(drive_root, task_id)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    entry = json.dumps({
+    ensure_dir(path.parent)
+    entry = json_dumpb({
         "msg_id": msg_id or uuid.uuid4().hex,
         "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         "text": text,
-    }, ensure_ascii=False)
+    })
     try:
-        with path.open("a", encoding="utf-8") as f:
-            f.write(entry + "\n")
+        _append_line(path, entry + b"\n")
     except Exception:
+        forget_dir(path.parent)
         log.debug("Failed to write owner message for task %s", task_id, exc_info=True)
 
 
@@ -62,41 +122,43 @@ def drain_owner_messages(
     new message IDs are added to it. Caller should keep the set across rounds.
     """
     path = _mailbox_path(drive_root, task_id)
-    if not path.exists():
-        return []
     if seen_ids is None:
         seen_ids = set()
+    messages: List[str] = []
+    loads = json_loads
+    append = messages.append
     try:
-        content = path.read_text(encoding="utf-8").strip()
-        if not content:
-            return []
-        messages = []
-        for line in content.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-                mid = entry.get("msg_id", "")
-                if mid and mid in seen_ids:
+        # Single open, no exists() probe: each probe is a Drive round-trip.
+        # Lines stay bytes; json_loads parses them without a decode step and
+        # tolerates the trailing newline, so no per-line strip() copy.
+        with path.open("rb") as f:
+            for line in f:
+                if line.isspace():
                     continue
-                if mid:
-                    seen_ids.add(mid)
-                text = entry.get("text", "")
-                if text:
-                    messages.append(text)
-            except Exception:
-                log.debug("Malformed mailbox line for task %s", task_id, exc_info=True)
-        return messages
+                try:
+                    entry = loads(line)
+                    mid = entry.get("msg_id", "")
+                    if mid and mid in seen_ids:
+                        continue
+                    if mid:
+                        seen_ids.add(mid)
+                    text = entry.get("text", "")
+                    if text:
+                        append(text)
+                except Exception:
+                    log.debug("Malformed mailbox line for task %s", task_id, exc_info=True)
+    except FileNotFoundError:
+        return []
     except Exception:
         log.debug("Failed to read mailbox for task %s", task_id, exc_info=True)
-        return []
+    return messages
 
 
 def cleanup_task_mailbox(drive_root: pathlib.Path, task_id: str) -> None:
     """Remove a task's mailbox file after task completes."""
     path = _mailbox_path(drive_root, task_id)
     try:
+        _close_handle(path)
         if path.exists():
             path.unlink()
     except Exception:
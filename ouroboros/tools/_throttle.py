@@ -0,0 +1,53 @@
+"""Per-host request throttling for browser-driven tools.
+
+Not a tool module (leading underscore keeps it out of tool discovery).
+Spaces out navigations to the same host and slows down further for a while
+after the site pushes back (HTTP 429/403, captcha page), so we back off
+before an IP ban rather than after.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Tuple
+
+
+class DomainThrottle:
+    """Minimum interval between requests per host, with temporary penalties."""
+
+    def __init__(self, rps: float, penalty_sec: float = 5 * 60, max_factor: float = 16.0):
+        self.min_interval = 1.0 / rps
+        self.penalty_sec = penalty_sec
+        self.max_factor = max_factor
+        self._next_at: Dict[str, float] = {}
+        self._penalty: Dict[str, Tuple[float, float]] = {}  # host -> (factor, until)
+        self._lock = threading.Lock()
+
+    def interval(self, host: str) -> float:
+        factor, until = self._penalty.get(host, (1.0, 0.0))
+        if time.monotonic() >= until:
+            return self.min_interval
+        return self.min_interval * factor
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to host is allowed. Returns seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at.get(host, 0.0))
+            self._next_at[host] = start + self.interval(host)
+        sleep_for = start - now
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+        return max(0.0, sleep_for)
+
+    def penalize(self, host: str) -> None:
+        """Double the host's interval (up to max_factor) for penalty_sec."""
+        with self._lock:
+            now = time.monotonic()
+            factor, until = self._penalty.get(host, (1.0, 0.0))
+            if now >= until:
+                factor = 1.0
+            factor = min(factor * 2, self.max_factor)
+            self._penalty[host] = (factor, now + self.penalty_sec)
+            self._next_at[host] = max(self._next_at.get(host, 0.0), now + self.min_interval * factor)
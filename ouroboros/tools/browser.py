@@ -31,6 +31,7 @@ except ImportError:
     _HAS_STEALTH = False
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
+from ouroboros.utils import ensure_dir
 
 log = logging.getLogger(__name__)
 
@@ -41,8 +42,8 @@ _pw_thread_id = None
 
 def _get_session_path(ctx: ToolContext, session_name: str = "default") -> Path:
     """Get path for storing browser session data on Drive."""
-    sessions_dir = ctx.drive_root() / "browser_sessions"
-    sessions_dir.mkdir(parents=True, exist_ok=True)
+    sessions_dir = ctx.drive_root / "browser_sessions"
+    ensure_dir(sessions_dir)
     return sessions_dir / f"{session_name}_session.json"
 
 
@@ -161,11 +162,18 @@ def _human_delay(min_sec=1.0, max_sec=3.0):
 
 
 def _human_type(page: Any, selector: str, text: str):
-    """Type text char by char like a human."""
+    """Type text like a human: per-key delays, short pauses between bursts.
+
+    Keys are sent in bursts of a few characters; Playwright applies the
+    per-key delay itself, so a burst is one call instead of one per char.
+    """
     page.click(selector)
-    for char in text:
-        page.type(selector, char, delay=random.randint(50, 150))
-        if random.random() < 0.1:
+    i = 0
+    while i < len(text):
+        n = random.randint(4, 12)
+        page.keyboard.type(text[i:i + n], delay=random.randint(50, 150))
+        i += n
+        if random.random() < 0.3:
             time.sleep(random.uniform(0.1, 0.3))
 
 
@@ -228,6 +236,9 @@ def _ensure_browser(ctx: ToolContext, session_name: str = "default"):
             "--disable-dev-shm-usage",
             "--disable-blink-features=AutomationControlled",
             "--disable-infobars",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-background-timer-throttling",
             "--window-size=1920,1080",
         ],
     )
@@ -6,46 +6,117 @@ Secure storage for LinkedIn, Kwork, and other platform credentials.
 from __future__ import annotations
 
 import base64
+import copy
+import functools
 import json
 import os
 import pathlib
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
-from cryptography.fernet import Fernet
 from ouroboros.tools.registry import ToolContext, ToolEntry
+from ouroboros.utils import ensure_dir, json_dumpb, json_loads, utc_now_iso
 
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
 
-def _get_encryption_key(ctx: ToolContext) -> bytes:
+# Decrypted credentials per file: path -> (st_mtime_ns, data). Callers get deep copies.
+_LOAD_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# Forked workers must not inherit the parent's decrypted plaintext.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_LOAD_CACHE.clear)
+
+
+_O_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_fernet() -> type:
+    """Import Fernet on first credential operation (cryptography is heavy)."""
+    from cryptography.fernet import Fernet
+    return Fernet
+
+
+def _read_file(path: pathlib.Path) -> bytes:
+    """Read a whole file with a single open and sized read."""
+    fd = os.open(str(path), os.O_RDONLY | _O_CLOEXEC)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 4096))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+    os.fsync(fd)
+
+
+def _get_encryption_key(drive_root: pathlib.Path) -> bytes:
     """Get or create encryption key from Drive."""
-    key_path = ctx.drive_root() / "state" / "encryption.key"
+    key_path = drive_root / "state" / "encryption.key"
     
-    if key_path.exists():
-        return key_path.read_bytes()
-    else:
-        key = Fernet.generate_key()
-        key_path.parent.mkdir(parents=True, exist_ok=True)
-        key_path.write_bytes(key)
+    try:
+        return _read_file(key_path)
+    except FileNotFoundError:
+        key = _load_fernet().generate_key()
+        ensure_dir(key_path.parent)
+        try:
+            # O_EXCL: never clobber a key another process created meanwhile.
+            fd = os.open(str(key_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_CLOEXEC, 0o600)
+        except FileExistsError:
+            return _read_file(key_path)
+        try:
+            _write_fd(fd, key)
+        finally:
+            os.close(fd)
         return key
 
 
+@functools.lru_cache(maxsize=8)
+def _cipher_for(drive_root: str) -> Fernet:
+    """Fernet cipher for a Drive root; the key file is read once per process."""
+    return _load_fernet()(_get_encryption_key(pathlib.Path(drive_root)))
+
+
+def _get_cipher(ctx: ToolContext) -> Fernet:
+    return _cipher_for(str(ctx.drive_root))
+
+
 def _get_credentials_path(ctx: ToolContext) -> pathlib.Path:
     """Get credentials storage path."""
-    return ctx.drive_root() / "state" / "credentials.json"
+    return ctx.drive_root / "state" / "credentials.json"
 
 
 def _load_credentials(ctx: ToolContext) -> Dict[str, Any]:
     """Load and decrypt credentials."""
     creds_path = _get_credentials_path(ctx)
     
-    if not creds_path.exists():
-        return {}
-    
     try:
-        key = _get_encryption_key(ctx)
-        f = Fernet(key)
-        encrypted_data = creds_path.read_bytes()
-        decrypted_data = f.decrypt(encrypted_data)
-        return json.loads(decrypted_data.decode('utf-8'))
+        cache_key = str(creds_path)
+        st = creds_path.stat()
+        if st.st_size == 0:
+            # Empty file (e.g. interrupted first save): nothing to decrypt.
+            return {}
+        mtime_ns = st.st_mtime_ns
+        cached = _LOAD_CACHE.get(cache_key)
+        if cached is not None and cached[0] == mtime_ns:
+            return copy.deepcopy(cached[1])
+        encrypted_data = _read_file(creds_path)
+        decrypted_data = _get_cipher(ctx).decrypt(encrypted_data)
+        credentials = json_loads(decrypted_data)
+        _LOAD_CACHE[cache_key] = (mtime_ns, credentials)
+        return copy.deepcopy(credentials)
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         return {"_error": str(e)}
 
@@ -53,19 +124,22 @@ def _load_credentials(ctx: ToolContext) -> Dict[str, Any]:
 def _save_credentials(ctx: ToolContext, credentials: Dict[str, Any]) -> bool:
     """Encrypt and save credentials."""
     try:
-        key = _get_encryption_key(ctx)
-        f = Fernet(key)
         creds_path = _get_credentials_path(ctx)
         
         # Serialize and encrypt
-        json_data = json.dumps(credentials, ensure_ascii=False).encode('utf-8')
-        encrypted_data = f.encrypt(json_data)
+        json_data = json_dumpb(credentials)
+        encrypted_data = _get_cipher(ctx).encrypt(json_data)
         
-        # Atomic write
-        creds_path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic write: owner-only tmp file, fsync, then replace
+        ensure_dir(creds_path.parent)
         tmp_path = creds_path.with_suffix('.tmp')
-        tmp_path.write_bytes(encrypted_data)
-        tmp_path.rename(creds_path)
+        fd = os.open(str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_CLOEXEC, 0o600)
+        try:
+            _write_fd(fd, encrypted_data)
+        finally:
+            os.close(fd)
+        os.replace(str(tmp_path), str(creds_path))
+        _LOAD_CACHE.pop(str(creds_path), None)
         
         return True
     except Exception as e:
@@ -95,7 +169,7 @@ def _store_credentials_impl(
         "email": email,
         "password": password,
         "extra": extra,
-        "updated_at": __import__('datetime').datetime.now().isoformat()
+        "updated_at": utc_now_iso()
     }
     
     if _save_credentials(ctx, credentials):
@@ -150,7 +224,7 @@ def _manage_credentials_impl(
                 f"📋 {platform} credentials:\n"
                 f"  Email: {data.get('email', 'N/A')}\n"
                 f"  Updated: {data.get('updated_at', 'N/A')}\n"
-                f"  Extra: {json.dumps(data.get('extra', {}), indent=2)}"
+                f"  Extra: {json.dumps(data.get('extra', {}), ensure_ascii=False)}"
             )
         else:
             return f"⚠️ No credentials found for {platform}"
@@ -8,23 +8,144 @@ Supports persistent sessions via cookies stored on Google Drive.
 from __future__ import annotations
 
 import json
+import re
+import threading
 import time
 import random
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
 from ouroboros.tools.credentials import _load_credentials
+from ouroboros.tools._throttle import DomainThrottle
+
+
+# At most one Kwork navigation every 2s; slower for 5 min after a 429/403/captcha.
+_KWORK_HOST = "kwork.ru"
+_THROTTLE = DomainThrottle(rps=0.5)
+
+
+def _goto(page: Any, url: str) -> Any:
+    """Throttled page.goto for kwork.ru; backs off when the site pushes back."""
+    _THROTTLE.acquire(_KWORK_HOST)
+    response = page.goto(url, wait_until="domcontentloaded", timeout=30000)
+    status = response.status if response is not None else 0
+    if status in (403, 429) or "captcha" in page.url:
+        _THROTTLE.penalize(_KWORK_HOST)
+    return response
+
+
+# First amount in a price label, allowing thousands separators ("до 5 000 ₽").
+_BUDGET_RE = re.compile(r"\d+(?:[ \u00a0\u202f]\d{3})*")
+_DIGIT_SEP_RE = re.compile(r"[ \u00a0\u202f]")
+
+
+def _parse_budget(text: str) -> int:
+    m = _BUDGET_RE.search(text)
+    return int(_DIGIT_SEP_RE.sub("", m.group())) if m else 0
+
+
+# Scroll to trigger lazy loading, then extract every card in the same call,
+# so the whole listing costs one browser round-trip.
+_ORDER_CARDS_JS = """async (limit) => {
+    const pause = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+    for (let i = 0; i < 3; i++) {
+        window.scrollBy(0, 1000);
+        await pause(500 + Math.random() * 500);
+    }
+    window.scrollTo(0, 0);
+    await pause(1000 + Math.random() * 1000);
+    const cards = Array.from(document.querySelectorAll('div.kwork-card, div.card__item'));
+    return cards.slice(0, limit).map(card => {
+        const text = (sel) => {
+            const el = card.querySelector(sel);
+            return el ? el.innerText.trim() : '';
+        };
+        const titleEl = card.querySelector('a.kwork-card__title, a.card__title');
+        return {
+            title: titleEl ? titleEl.innerText.trim() : '',
+            link: titleEl ? (titleEl.getAttribute('href') || '') : '',
+            budget: text('div.kwork-card__price, div.card__price'),
+            description: text('div.kwork-card__description, div.card__desc'),
+        };
+    });
+}"""
+
+
+_ORDER_TMPL = "{i}. **{title}** ({budget})\n   {description}\n   🔗 {url}\n"
+
+
+# Recent non-empty search listings: (keywords, min_budget, max_results) -> (monotonic ts, text).
+# Repeated searches within the TTL skip the browser entirely.
+_SEARCH_CACHE_TTL_SEC = 5 * 60
+_SEARCH_CACHE: Dict[Tuple[str, int, int], Tuple[float, str]] = {}
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _cached_search(key: Tuple[str, int, int]) -> Optional[str]:
+    with _SEARCH_CACHE_LOCK:
+        hit = _SEARCH_CACHE.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _SEARCH_CACHE_TTL_SEC:
+        return hit[1]
+    return None
+
+
+def _remember_search(key: Tuple[str, int, int], result: str) -> None:
+    now = time.monotonic()
+    with _SEARCH_CACHE_LOCK:
+        for k in [k for k, (ts, _) in _SEARCH_CACHE.items() if now - ts >= _SEARCH_CACHE_TTL_SEC]:
+            del _SEARCH_CACHE[k]
+        _SEARCH_CACHE[key] = (now, result)
+
+
+# monotonic ts of this process's last successful login (0 = none) and the page
+# it happened on. Within the window, and only while that page is still the
+# task's page, the login check needs no browser round-trip. A closed or
+# relaunched browser (cleanup_browser) leaves a different page, which drops
+# the shortcut. Kept short: Kwork can expire the session server-side at any time.
+_LOGIN_FRESH_SEC = 10 * 60
+_LAST_LOGIN_TS = 0.0
+_LOGIN_PAGE: Any = None
+
+
+def _remember_login(page: Any) -> None:
+    global _LAST_LOGIN_TS, _LOGIN_PAGE
+    _LAST_LOGIN_TS = time.monotonic()
+    _LOGIN_PAGE = page
+
+
+def _forget_login() -> None:
+    global _LAST_LOGIN_TS, _LOGIN_PAGE
+    _LAST_LOGIN_TS = 0.0
+    _LOGIN_PAGE = None
+
+
+def _login_recent(page: Any) -> bool:
+    if page is None or page is not _LOGIN_PAGE:
+        _forget_login()  # browser torn down since the login
+        return False
+    return bool(_LAST_LOGIN_TS) and time.monotonic() - _LAST_LOGIN_TS < _LOGIN_FRESH_SEC
+
+
+def _is_login_url(url: str) -> bool:
+    # Path check, not substring: search URLs carry the user's keywords.
+    return urlsplit(url).path.startswith("/login")
+
+
+def _on_login_page(page: Any) -> bool:
+    return _is_login_url(page.url)
 
 
 def _check_kwork_logged_in(ctx: ToolContext) -> bool:
     """Check if already logged in to Kwork."""
     try:
         page = ctx.browser_state.page
+        if _login_recent(page):
+            return True
         if page is None:
             return False
         
-        current_url = page.url
-        if "kwork.ru" in current_url and "login" not in current_url:
+        if "kwork.ru" in page.url and not _on_login_page(page):
             return True
         
         cookies = page.context.cookies()
@@ -36,26 +157,29 @@ def _check_kwork_logged_in(ctx: ToolContext) -> bool:
         return False
 
 
-def _kwork_login_impl(ctx: ToolContext, force: bool = False) -> str:
-    """Login to Kwork using stored credentials."""
+def _kwork_login(ctx: ToolContext, force: bool = False) -> Tuple[bool, str]:
+    """Login to Kwork using stored credentials. Returns (ok, message)."""
     ctx.browser_session_name = "kwork"
-    from ouroboros.tools.browser import _ensure_browser, _human_type, _human_click, _human_delay
+    from ouroboros.tools.browser import (
+        _ensure_browser, _human_type, _human_click, _human_delay, _save_cookies,
+    )
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
     
     page = _ensure_browser(ctx)
     if not force and _check_kwork_logged_in(ctx):
-        return "✅ Already logged in to Kwork (session restored)"
+        return True, "✅ Already logged in to Kwork (session restored)"
     
     credentials = _load_credentials(ctx)
     if "kwork" not in credentials:
-        return "⚠️ No Kwork credentials found. Use store_credentials first."
+        return False, "⚠️ No Kwork credentials found. Use store_credentials first."
 
     creds = credentials["kwork"]
     login_email = creds.get("email")
     login_password = creds.get("password")
 
     try:
-        page.goto("https://kwork.ru/login", wait_until="networkidle", timeout=30000)
-        _human_delay(1, 3)
+        _goto(page, "https://kwork.ru/login")
+        page.locator('input[name="login"]').first.wait_for(state="visible", timeout=10000)
 
         # Fill email with human typing
         _human_type(page, 'input[name="login"]', login_email)
@@ -68,15 +192,25 @@ def _kwork_login_impl(ctx: ToolContext, force: bool = False) -> str:
         # Click submit with human mouse move
         _human_click(page, 'button[type="submit"]')
 
-        page.wait_for_load_state("networkidle", timeout=30000)
-        _human_delay(3, 5)
+        # Wait for the redirect away from /login instead of a fixed pause
+        try:
+            page.wait_for_url(lambda url: not _is_login_url(url), timeout=15000)
+        except PlaywrightTimeoutError:
+            pass  # still on /login: reported as a failure below
 
-        if "login" not in page.url:
-            return f"✅ Kwork login successful: {login_email}"
+        if not _on_login_page(page):
+            _remember_login(page)
+            _save_cookies(ctx, "kwork")
+            return True, f"✅ Kwork login successful: {login_email}"
         else:
-            return f"⚠️ Kwork login failed. URL: {page.url}"
+            return False, f"⚠️ Kwork login failed. URL: {page.url}"
     except Exception as e:
-        return f"⚠️ Kwork login error: {repr(e)}"
+        return False, f"⚠️ Kwork login error: {repr(e)}"
+
+
+def _kwork_login_impl(ctx: ToolContext, force: bool = False) -> str:
+    """Login to Kwork using stored credentials."""
+    return _kwork_login(ctx, force)[1]
 
 
 def _search_kwork_orders_impl(
@@ -87,61 +221,58 @@ def _search_kwork_orders_impl(
     auto_login: bool = True
 ) -> str:
     """Search for orders on Kwork with improved stability."""
+    cache_key = (keywords.strip().lower(), int(min_budget or 0), int(max_results or 0))
+    cached = _cached_search(cache_key)
+    if cached is not None:
+        return cached
+    
     ctx.browser_session_name = "kwork"
-    from ouroboros.tools.browser import _ensure_browser, _human_delay
+    from ouroboros.tools.browser import _ensure_browser
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
     
     page = _ensure_browser(ctx)
-    if auto_login and not _check_kwork_logged_in(ctx):
-        _kwork_login_impl(ctx)
-    
     try:
-        search_url = f"https://kwork.ru/birza?keyword={keywords.replace(' ', '%20')}"
-        page.goto(search_url, wait_until="networkidle", timeout=30000)
-        
-        # Scroll down to trigger lazy loading of orders
-        for _ in range(3):
-            page.evaluate("window.scrollBy(0, 1000)")
-            _human_delay(0.5, 1.0)
-        page.evaluate("window.scrollTo(0, 0)")
-        _human_delay(1.0, 2.0)
+        # Navigate first and log in only if Kwork bounces us to /login:
+        # a live session (the common case) costs a single page load.
+        search_url = f"https://kwork.ru/birza?{urlencode({'keyword': keywords})}"
+        _goto(page, search_url)
+        if auto_login and _on_login_page(page):
+            _forget_login()  # session expired server-side
+            ok, login_msg = _kwork_login(ctx, force=True)
+            if not ok:
+                return login_msg
+            _goto(page, search_url)
+        try:
+            page.locator('div.kwork-card, div.card__item').first.wait_for(state="attached", timeout=15000)
+        except PlaywrightTimeoutError:
+            return f"📭 No orders found for '{keywords}'"
         
+        # Lazy-load scrolling and card extraction in one browser round-trip
+        cards = page.evaluate(_ORDER_CARDS_JS, max_results)
         orders = []
-        # Update selectors to be more robust
-        order_cards = page.locator('div.kwork-card, div.card__item').all()
-        
-        for card in order_cards[:max_results]:
-            try:
-                title_el = card.locator('a.kwork-card__title, a.card__title').first
-                title = title_el.inner_text()
-                link = title_el.get_attribute('href')
-                
-                budget_el = card.locator('div.kwork-card__price, div.card__price').first
-                budget = budget_el.inner_text()
-                
-                desc_el = card.locator('div.kwork-card__description, div.card__desc').first
-                description = desc_el.inner_text()
-                
-                budget_val = int(''.join(filter(str.isdigit, budget)) or "0")
-                if budget_val < min_budget:
-                    continue
-                
-                orders.append({
-                    "title": title,
-                    "budget": budget,
-                    "description": description[:300],
-                    "url": f"https://kwork.ru{link}" if link.startswith('/') else link
-                })
-            except Exception:
+        for card in cards:
+            title, link, budget = card["title"], card["link"], card["budget"]
+            if not title or not link:
                 continue
+            
+            if _parse_budget(budget) < min_budget:
+                continue
+            
+            orders.append({
+                "title": title,
+                "budget": budget,
+                "description": card["description"][:300],
+                "url": f"https://kwork.ru{link}" if link.startswith('/') else link
+            })
         
         if not orders:
             return f"📭 No orders found for '{keywords}'"
         
-        lines = [f"💼 Found {len(orders)} orders on Kwork for '{keywords}':\n"]
-        for i, order in enumerate(orders, 1):
-            lines.append(f"{i}. **{order['title']}** ({order['budget']})\n   {order['description']}\n   🔗 {order['url']}\n")
-        
-        return "\n".join(lines)
+        result = f"💼 Found {len(orders)} orders on Kwork for '{keywords}':\n\n" + "\n".join(
+            _ORDER_TMPL.format(i=i, **order) for i, order in enumerate(orders, 1)
+        )
+        _remember_search(cache_key, result)
+        return result
     except Exception as e:
         return f"⚠️ Order search error: {repr(e)}"
 
@@ -155,19 +286,25 @@ def _submit_kwork_proposal_impl(
     """Submit proposal with human-like interaction."""
     ctx.browser_session_name = "kwork"
     from ouroboros.tools.browser import _ensure_browser, _human_type, _human_click, _human_delay
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
     
     page = _ensure_browser(ctx)
     try:
-        page.goto(order_url, wait_until="networkidle", timeout=30000)
-        _human_delay(2, 4)
+        _goto(page, order_url)
+        if _on_login_page(page):
+            _forget_login()  # session expired server-side
+            return "⚠️ Kwork session expired. Run kwork_login and retry."
         
-        # Click proposal button
+        # Click proposal button once it renders
         btn = page.locator('button:has-text("Сделать предложение"), button:has-text("Откликнуться")').first
-        if btn.count() == 0:
+        try:
+            btn.wait_for(state="visible", timeout=10000)
+        except PlaywrightTimeoutError:
             return "⚠️ Proposal button not found. Order closed?"
         
         _human_click(page, 'button:has-text("Сделать предложение"), button:has-text("Откликнуться")')
-        _human_delay(1.5, 3)
+        message_box = page.locator('textarea[name="message"]').first
+        message_box.wait_for(state="visible", timeout=10000)
         
         # Fill proposal text with human typing
         _human_type(page, 'textarea[name="message"]', proposal_text)
@@ -177,30 +314,36 @@ def _submit_kwork_proposal_impl(
             _human_type(page, 'input[name="price"]', str(price))
             _human_delay(0.5, 1)
             
-        # Final submit
+        # Final submit: the form closing is the success signal
         _human_click(page, 'button:has-text("Отправить")')
-        _human_delay(3, 5)
+        try:
+            message_box.wait_for(state="hidden", timeout=10000)
+        except PlaywrightTimeoutError:
+            return "⚠️ Proposal form still open after submit. Check the order page for errors."
         
         return "✅ Proposal submitted successfully."
     except Exception as e:
         return f"⚠️ Proposal error: {repr(e)}"
 
 
+_TOOLS: List[ToolEntry] = [
+    ToolEntry("kwork_login", {
+        "name": "kwork_login",
+        "description": "Login to Kwork using stored credentials. Auto-uses saved session cookies.",
+        "parameters": {"type": "object", "properties": {"force": {"type": "boolean", "description": "Force re-login"}}, "required": []},
+    }, _kwork_login_impl),
+    ToolEntry("search_kwork_orders", {
+        "name": "search_kwork_orders",
+        "description": "Search for orders on Kwork. Returns list of available orders matching keywords.",
+        "parameters": {"type": "object", "properties": {"keywords": {"type": "string", "description": "Search keywords"}, "min_budget": {"type": "integer", "description": "Minimum budget in RUB"}}, "required": ["keywords"]},
+    }, _search_kwork_orders_impl),
+    ToolEntry("submit_kwork_proposal", {
+        "name": "submit_kwork_proposal",
+        "description": "Submit a proposal to a Kwork order.",
+        "parameters": {"type": "object", "properties": {"order_url": {"type": "string", "description": "Kwork order URL"}, "proposal_text": {"type": "string", "description": "Proposal message"}, "price": {"type": "integer", "description": "Proposed price in RUB"}}, "required": ["order_url", "proposal_text"]},
+    }, _submit_kwork_proposal_impl),
+]
+
+
 def get_tools() -> List[ToolEntry]:
-    return [
-        ToolEntry("kwork_login", {
-            "name": "kwork_login",
-            "description": "Login to Kwork using stored credentials. Auto-uses saved session cookies.",
-            "parameters": {"type": "object", "properties": {"force": {"type": "boolean", "description": "Force re-login"}}, "required": []},
-        }, _kwork_login_impl),
-        ToolEntry("search_kwork_orders", {
-            "name": "search_kwork_orders",
-            "description": "Search for orders on Kwork. Returns list of available orders matching keywords.",
-            "parameters": {"type": "object", "properties": {"keywords": {"type": "string", "description": "Search keywords"}, "min_budget": {"type": "integer", "description": "Minimum budget in RUB"}}, "required": ["keywords"]},
-        }, _search_kwork_orders_impl),
-        ToolEntry("submit_kwork_proposal", {
-            "name": "submit_kwork_proposal",
-            "description": "Submit a proposal to a Kwork order.",
-            "parameters": {"type": "object", "properties": {"order_url": {"type": "string", "description": "Kwork order URL"}, "proposal_text": {"type": "string", "description": "Proposal message"}, "price": {"type": "integer", "description": "Proposed price in RUB"}}, "required": ["order_url", "proposal_text"]},
-        }, _submit_kwork_proposal_impl),
-    ]
+    return list(_TOOLS)
@@ -7,12 +7,74 @@ Uses browser automation via browse_page and browser_action.
 from __future__ import annotations
 
 import json
+import re
+import threading
 import time
-from typing import Any, Dict, List, Optional
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
+from ouroboros.tools.browser import _ensure_browser
 from ouroboros.tools.credentials import _load_credentials
 
+try:
+    from supervisor.queue import enqueue_task
+except ImportError:  # tools loaded without the supervisor package
+    enqueue_task = None
+
+
+# Where a submitted login form ends up: signed in (feed/network) or a challenge.
+_LOGIN_LANDING_RE = re.compile(r"linkedin\.com/(feed|mynetwork|checkpoint)")
+
+
+# Job card fields for up to `limit` cards, extracted in a single evaluate call.
+_JOB_CARDS_JS = """(limit) => {
+    const cards = Array.from(document.querySelectorAll('div.job-card-container--clickable'));
+    return cards.slice(0, limit).map(card => {
+        const text = (sel) => {
+            const el = card.querySelector(sel);
+            return el ? el.innerText.trim() : '';
+        };
+        const linkEl = card.querySelector('a.job-card-list__title');
+        return {
+            title: text('div.job-card-list__title'),
+            company: text('div.job-card-container__company-name'),
+            location: text('div.job-card-container__metadata-item'),
+            link: linkEl ? (linkEl.getAttribute('href') || '') : '',
+        };
+    });
+}"""
+
+
+# Recent non-empty job listings: (keywords, location, date_posted, max_results)
+# -> (monotonic ts, text). LinkedIn's results are stable over minutes.
+_JOB_CACHE_TTL_SEC = 5 * 60
+_JOB_CACHE: Dict[Tuple[str, str, str, int], Tuple[float, str]] = {}
+_JOB_CACHE_LOCK = threading.Lock()
+
+
+def _cached_jobs(key: Tuple[str, str, str, int]) -> Optional[str]:
+    with _JOB_CACHE_LOCK:
+        hit = _JOB_CACHE.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _JOB_CACHE_TTL_SEC:
+        return hit[1]
+    return None
+
+
+def _remember_jobs(key: Tuple[str, str, str, int], result: str) -> None:
+    now = time.monotonic()
+    with _JOB_CACHE_LOCK:
+        for k in [k for k, (ts, _) in _JOB_CACHE.items() if now - ts >= _JOB_CACHE_TTL_SEC]:
+            del _JOB_CACHE[k]
+        _JOB_CACHE[key] = (now, result)
+
+
+def _linkedin_page(ctx: ToolContext) -> Any:
+    """Task browser page, launched on demand with the LinkedIn cookie session."""
+    ctx.browser_session_name = "linkedin"
+    return _ensure_browser(ctx)
+
 
 def _linkedin_login_impl(ctx: ToolContext, email: Optional[str] = None) -> str:
     """Login to LinkedIn using stored credentials."""
@@ -28,13 +90,16 @@ def _linkedin_login_impl(ctx: ToolContext, email: Optional[str] = None) -> str:
     if not login_email or not login_password:
         return "⚠️ Incomplete credentials"
     
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
     try:
         # Navigate to LinkedIn login
-        page = ctx.browser_state.page
-        page.goto("https://www.linkedin.com/login", wait_until="networkidle", timeout=30000)
+        page = _linkedin_page(ctx)
+        page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded", timeout=30000)
         
-        # Fill email
+        # Fill email once the form renders
         email_input = page.locator("#username")
+        email_input.wait_for(state="visible", timeout=15000)
         email_input.fill(login_email)
         
         # Fill password
@@ -45,9 +110,11 @@ def _linkedin_login_impl(ctx: ToolContext, email: Optional[str] = None) -> str:
         submit_btn = page.locator('button[type="submit"]')
         submit_btn.click()
         
-        # Wait for navigation
-        page.wait_for_load_state("networkidle", timeout=30000)
-        time.sleep(3)  # Extra wait for LinkedIn's slow redirects
+        # Wait for LinkedIn's redirect chain to land somewhere meaningful
+        try:
+            page.wait_for_url(_LOGIN_LANDING_RE, timeout=30000)
+        except PlaywrightTimeoutError:
+            pass  # still on /login: reported as a failure below
         
         # Check if login succeeded
         current_url = page.url
@@ -68,28 +135,32 @@ def _linkedin_post_impl(
     visibility: str = "public"
 ) -> str:
     """Create a post on LinkedIn."""
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
     try:
-        page = ctx.browser_state.page
+        page = _linkedin_page(ctx)
         
         # Navigate to post creation
-        page.goto("https://www.linkedin.com/feed/", wait_until="networkidle", timeout=30000)
-        time.sleep(2)
+        page.goto("https://www.linkedin.com/feed/", wait_until="domcontentloaded", timeout=30000)
         
-        # Find and click the post input
+        # Find and click the post input once it renders
         try:
             post_input = page.locator('div[role="textbox"]').first
+            post_input.wait_for(state="visible", timeout=15000)
             post_input.click()
-            time.sleep(1)
             
-            # Clear and fill
+            # Clear and fill (fill waits for the editor to be editable)
             post_input.fill(content)
-            time.sleep(1)
             
-            # Find and click post button
+            # Find and click post button (click waits for it to be enabled)
             post_btn = page.locator('button:has-text("Post")').first
             post_btn.click()
             
-            time.sleep(3)
+            # The composer closing is the success signal
+            try:
+                post_input.wait_for(state="hidden", timeout=15000)
+            except PlaywrightTimeoutError:
+                return "⚠️ Post composer still open after submit. Check LinkedIn for errors."
             
             return f"✅ LinkedIn post published ({len(content)} chars)"
         
@@ -105,52 +176,45 @@ def _linkedin_job_search_impl(
     keywords: str,
     location: str = "Remote",
     date_posted: str = "week",
-    max_results: int = 10
+    max_results: int = 10,
+    bypass_cache: bool = False
 ) -> str:
     """Search for jobs on LinkedIn."""
+    cache_key = (keywords.strip().lower(), location.strip().lower(), date_posted, int(max_results or 0))
+    if not bypass_cache:
+        cached = _cached_jobs(cache_key)
+        if cached is not None:
+            return cached
+    
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
     try:
-        page = ctx.browser_state.page
+        page = _linkedin_page(ctx)
         
         # Build search URL
         date_filters = {"all": "", "month": "r2592000", "week": "r604800", "day": "r86400"}
         date_param = date_filters.get(date_posted, "r604800")
         
-        search_url = (
-            f"https://www.linkedin.com/jobs/search/"
-            f"?keywords={keywords.replace(' ', '%20')}"
-            f"&location={location.replace(' ', '%20')}"
-            f"&f_TPR={date_param}"
+        search_url = "https://www.linkedin.com/jobs/search/?" + urlencode(
+            {"keywords": keywords, "location": location, "f_TPR": date_param}
         )
         
-        page.goto(search_url, wait_until="networkidle", timeout=30000)
-        time.sleep(3)
+        page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
+        try:
+            page.wait_for_selector('div.job-card-container--clickable', timeout=15000)
+        except PlaywrightTimeoutError:
+            return f"📭 No jobs found for '{keywords}' in {location}"
         
-        # Extract job listings
+        # Extract job listings in one browser round-trip
         jobs = []
-        job_cards = page.locator('div.job-card-container--clickable').all()
-        
-        for i, card in enumerate(job_cards[:max_results]):
-            try:
-                title_el = card.locator('div.job-card-list__title').first
-                company_el = card.locator('div.job-card-container__company-name').first
-                location_el = card.locator('div.job-card-container__metadata-item').first
-                
-                title = title_el.inner_text() if title_el.count() > 0 else "Unknown"
-                company = company_el.inner_text() if company_el.count() > 0 else "Unknown"
-                job_location = location_el.inner_text() if location_el.count() > 0 else "Unknown"
-                
-                # Get job link
-                link_el = card.locator('a.job-card-list__title').first
-                link = link_el.get_attribute('href') if link_el.count() > 0 else ""
-                
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "location": job_location,
-                    "url": f"https://www.linkedin.com{link}" if link else ""
-                })
-            except Exception:
-                continue
+        for card in page.evaluate(_JOB_CARDS_JS, max_results):
+            link = card["link"]
+            jobs.append({
+                "title": card["title"] or "Unknown",
+                "company": card["company"] or "Unknown",
+                "location": card["location"] or "Unknown",
+                "url": f"https://www.linkedin.com{link}" if link else ""
+            })
         
         if not jobs:
             return f"📭 No jobs found for '{keywords}' in {location}"
@@ -164,7 +228,9 @@ def _linkedin_job_search_impl(
                 f"   🔗 {job['url']}\n"
             )
         
-        return "\n".join(lines)
+        result = "\n".join(lines)
+        _remember_jobs(cache_key, result)
+        return result
     
     except Exception as e:
         return f"⚠️ Job search error: {repr(e)}"
@@ -172,25 +238,26 @@ def _linkedin_job_search_impl(
 
 def _linkedin_apply_impl(ctx: ToolContext, job_url: str) -> str:
     """Apply to a LinkedIn job (Easy Apply only)."""
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
     try:
-        page = ctx.browser_state.page
+        page = _linkedin_page(ctx)
         
         # Navigate to job
-        page.goto(job_url, wait_until="networkidle", timeout=30000)
-        time.sleep(2)
+        page.goto(job_url, wait_until="domcontentloaded", timeout=30000)
         
         # Look for Easy Apply button
         try:
             apply_btn = page.locator('button.jobs-apply-button').first
+            apply_btn.wait_for(state="visible", timeout=15000)
             apply_btn.click()
-            time.sleep(2)
             
             # Check if it's Easy Apply (modal should appear)
-            modal = page.locator('div.jobs-easy-apply-modal')
-            if modal.count() > 0:
-                return "✅ Easy Apply started. Check browser for additional steps."
-            else:
+            try:
+                page.locator('div.jobs-easy-apply-modal').first.wait_for(state="visible", timeout=5000)
+            except PlaywrightTimeoutError:
                 return "⚠️ Not an Easy Apply job. Manual application required."
+            return "✅ Easy Apply started. Check browser for additional steps."
         
         except Exception:
             return "⚠️ No Easy Apply button found. Manual application required."
@@ -206,8 +273,8 @@ def _schedule_linkedin_post_impl(
     interval_hours: int = 12
 ) -> str:
     """Schedule regular LinkedIn posts."""
-    import uuid
-    from supervisor.queue import enqueue_task
+    if enqueue_task is None:
+        return "⚠️ Task queue unavailable (supervisor not loaded)"
     
     schedule_id = uuid.uuid4().hex[:8]
     
@@ -231,8 +298,8 @@ def _schedule_linkedin_monitoring_impl(
     check_interval_hours: int = 6
 ) -> str:
     """Schedule LinkedIn job monitoring."""
-    import uuid
-    from supervisor.queue import enqueue_task
+    if enqueue_task is None:
+        return "⚠️ Task queue unavailable (supervisor not loaded)"
     
     schedule_id = uuid.uuid4().hex[:8]
     
@@ -249,61 +316,65 @@ def _schedule_linkedin_monitoring_impl(
     return f"✅ LinkedIn monitoring scheduled (ID: {schedule_id}), every {check_interval_hours}h"
 
 
+_TOOLS: List[ToolEntry] = [
+    ToolEntry("linkedin_login", {
+        "name": "linkedin_login",
+        "description": "Login to LinkedIn using stored credentials. Requires store_credentials first.",
+        "parameters": {"type": "object", "properties": {
+            "email": {"type": "string", "description": "Optional: override email"},
+        }},
+    }, _linkedin_login_impl),
+    
+    ToolEntry("linkedin_post", {
+        "name": "linkedin_post",
+        "description": "Create a post on LinkedIn. Must be logged in first.",
+        "parameters": {"type": "object", "properties": {
+            "content": {"type": "string", "description": "Post content"},
+            "visibility": {"type": "string", "description": "public, connections, or group"},
+        }, "required": ["content"]},
+    }, _linkedin_post_impl),
+    
+    ToolEntry("linkedin_job_search", {
+        "name": "linkedin_job_search",
+        "description": "Search for jobs on LinkedIn with filters.",
+        "parameters": {"type": "object", "properties": {
+            "keywords": {"type": "string", "description": "Job keywords"},
+            "location": {"type": "string", "description": "Location (default: Remote)"},
+            "date_posted": {"type": "string", "description": "all, month, week, day"},
+            "max_results": {"type": "integer", "description": "Max results (default: 10)"},
+            "bypass_cache": {"type": "boolean", "description": "Skip results cached in the last 5 minutes"},
+        }, "required": ["keywords"]},
+    }, _linkedin_job_search_impl),
+    
+    ToolEntry("linkedin_apply", {
+        "name": "linkedin_apply",
+        "description": "Apply to a LinkedIn job (Easy Apply only).",
+        "parameters": {"type": "object", "properties": {
+            "job_url": {"type": "string", "description": "LinkedIn job URL"},
+        }, "required": ["job_url"]},
+    }, _linkedin_apply_impl),
+    
+    ToolEntry("schedule_linkedin_post", {
+        "name": "schedule_linkedin_post",
+        "description": "Schedule regular LinkedIn posts (e.g., 2x/day).",
+        "parameters": {"type": "object", "properties": {
+            "content": {"type": "string", "description": "Post content"},
+            "times_per_day": {"type": "integer", "description": "Posts per day (default: 2)"},
+            "interval_hours": {"type": "integer", "description": "Hours between posts"},
+        }, "required": ["content"]},
+    }, _schedule_linkedin_post_impl),
+    
+    ToolEntry("schedule_linkedin_monitoring", {
+        "name": "schedule_linkedin_monitoring",
+        "description": "Schedule LinkedIn job monitoring with keywords.",
+        "parameters": {"type": "object", "properties": {
+            "keywords": {"type": "string", "description": "Job keywords to monitor"},
+            "location": {"type": "string", "description": "Location (default: Remote)"},
+            "check_interval_hours": {"type": "integer", "description": "Hours between checks"},
+        }, "required": ["keywords"]},
+    }, _schedule_linkedin_monitoring_impl),
+]
+
+
 def get_tools() -> List[ToolEntry]:
-    return [
-        ToolEntry("linkedin_login", {
-            "name": "linkedin_login",
-            "description": "Login to LinkedIn using stored credentials. Requires store_credentials first.",
-            "parameters": {"type": "object", "properties": {
-                "email": {"type": "string", "description": "Optional: override email"},
-            }},
-        }, _linkedin_login_impl),
-        
-        ToolEntry("linkedin_post", {
-            "name": "linkedin_post",
-            "description": "Create a post on LinkedIn. Must be logged in first.",
-            "parameters": {"type": "object", "properties": {
-                "content": {"type": "string", "description": "Post content"},
-                "visibility": {"type": "string", "description": "public, connections, or group"},
-            }, "required": ["content"]},
-        }, _linkedin_post_impl),
-        
-        ToolEntry("linkedin_job_search", {
-            "name": "linkedin_job_search",
-            "description": "Search for jobs on LinkedIn with filters.",
-            "parameters": {"type": "object", "properties": {
-                "keywords": {"type": "string", "description": "Job keywords"},
-                "location": {"type": "string", "description": "Location (default: Remote)"},
-                "date_posted": {"type": "string", "description": "all, month, week, day"},
-                "max_results": {"type": "integer", "description": "Max results (default: 10)"},
-            }, "required": ["keywords"]},
-        }, _linkedin_job_search_impl),
-        
-        ToolEntry("linkedin_apply", {
-            "name": "linkedin_apply",
-            "description": "Apply to a LinkedIn job (Easy Apply only).",
-            "parameters": {"type": "object", "properties": {
-                "job_url": {"type": "string", "description": "LinkedIn job URL"},
-            }, "required": ["job_url"]},
-        }, _linkedin_apply_impl),
-        
-        ToolEntry("schedule_linkedin_post", {
-            "name": "schedule_linkedin_post",
-            "description": "Schedule regular LinkedIn posts (e.g., 2x/day).",
-            "parameters": {"type": "object", "properties": {
-                "content": {"type": "string", "description": "Post content"},
-                "times_per_day": {"type": "integer", "description": "Posts per day (default: 2)"},
-                "interval_hours": {"type": "integer", "description": "Hours between posts"},
-            }, "required": ["content"]},
-        }, _schedule_linkedin_post_impl),
-        
-        ToolEntry("schedule_linkedin_monitoring", {
-            "name": "schedule_linkedin_monitoring",
-            "description": "Schedule LinkedIn job monitoring with keywords.",
-            "parameters": {"type": "object", "properties": {
-                "keywords": {"type": "string", "description": "Job keywords to monitor"},
-                "location": {"type": "string", "description": "Location (default: Remote)"},
-                "check_interval_hours": {"type": "integer", "description": "Hours between checks"},
-            }, "required": ["keywords"]},
-        }, _schedule_linkedin_monitoring_impl),
-    ]
+    return list(_TOOLS)
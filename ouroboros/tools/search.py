@@ -9,12 +9,67 @@ Provides real web search via multiple methods:
 
 from __future__ import annotations
 
-import json
+import functools
 import os
+import random
+import re
+import threading
 import time
-from typing import Any, Dict, List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from html import unescape
+from itertools import islice
+from urllib.parse import parse_qs, quote, urlsplit
+
+try:
+    import lxml.html as _lxml_html
+except ImportError:
+    _lxml_html = None
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
+from ouroboros.utils import json_dumpb
+
+
+# Google result page patterns (simplified), compiled once. Used when lxml is
+# unavailable or finds nothing.
+_GOOGLE_TITLE_RE = re.compile(r'<h3[^>]*>([^<]+)</h3>')
+_GOOGLE_URL_RE = re.compile(r'href="((?:https?://(?:www\.)?google\.com)?/url\?q=[^"]+)"')
+
+
+def _dumps(result: Dict[str, Any]) -> str:
+    """Compact JSON for the tool result (orjson when installed)."""
+    return json_dumpb(result).decode("utf-8")
+
+
+def _format_hit(i: int, title: str, snippet: str, limit: int = 200) -> str:
+    """One numbered result line; the snippet is cut (with "...") only if long."""
+    if len(snippet) > limit:
+        snippet = snippet[:limit] + "..."
+    return f"{i}. **{title}**\n   {snippet}"
+
+
+# Per-request bounds so a hung provider cannot stall the fallback chain for
+# the SDK defaults (60s for Tavily, 600s for OpenAI).
+_TAVILY_TIMEOUT_SEC = 15.0
+_OPENAI_TIMEOUT_SEC = 30.0
+_OPENAI_MAX_RETRIES = 2
+
+
+@dataclass(frozen=True)
+class _SearchConfig:
+    tavily_key: str
+    openai_key: str
+
+
+@functools.lru_cache(maxsize=1)
+def _search_config() -> _SearchConfig:
+    """Provider keys, read from the environment once (the launcher sets them
+    before workers start). Call _search_config.cache_clear() to re-read."""
+    return _SearchConfig(
+        tavily_key=os.environ.get("TAVILY_API_KEY", ""),
+        openai_key=os.environ.get("OPENAI_API_KEY", ""),
+    )
 
 
 def _tavily_search(query: str, num_results: int = 5) -> Dict[str, Any]:
@@ -25,7 +80,7 @@ def _tavily_search(query: str, num_results: int = 5) -> Dict[str, Any]:
     Free tier: 1000 searches/month.
     Get key at: https://app.tavily.com/
     """
-    api_key = os.environ.get("TAVILY_API_KEY", "")
+    api_key = _search_config().tavily_key
     
     if not api_key:
         return {
@@ -47,6 +102,7 @@ def _tavily_search(query: str, num_results: int = 5) -> Dict[str, Any]:
             max_results=num_results,
             include_answer=True,
             include_raw_content=False,
+            timeout=_TAVILY_TIMEOUT_SEC,
         )
         
         # Tavily returns: answer, results (list with title, url, content, score)
@@ -60,20 +116,21 @@ def _tavily_search(query: str, num_results: int = 5) -> Dict[str, Any]:
                 "method": "tavily"
             }
         
-        # Format results
+        # Format results: sources and answer lines in one pass
         sources = []
-        for r in results[:num_results]:
+        lines = [answer or f"Search results for: {query}"]
+        for i, r in enumerate(islice(results, num_results), 1):
+            title = r.get("title", "Untitled")
+            snippet = r.get("content", "")
             sources.append({
-                "title": r.get("title", "Untitled"),
+                "title": title,
                 "url": r.get("url", ""),
-                "snippet": r.get("content", ""),
+                "snippet": snippet,
                 "score": r.get("score", 0)
             })
+            lines.append(_format_hit(i, title, snippet))
         
-        result_text = answer if answer else f"Search results for: {query}\n\n"
-        if sources:
-            for i, s in enumerate(sources, 1):
-                result_text += f"{i}. **{s['title']}**\n   {s['snippet'][:200]}...\n\n"
+        result_text = "\n\n".join(lines)
         
         return {
             "answer": result_text.strip(),
@@ -98,6 +155,77 @@ def _tavily_search(query: str, num_results: int = 5) -> Dict[str, Any]:
         }
 
 
+# One DDGS client and one requests.Session per process: their HTTP
+# connections (and TLS sessions) are reused across searches instead of
+# being rebuilt on every call.
+_DDGS: Optional[Any] = None
+_HTTP: Optional[Any] = None
+_OPENAI: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+_BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+
+def _get_ddgs() -> Any:
+    global _DDGS
+    with _CLIENTS_LOCK:
+        if _DDGS is None:
+            from duckduckgo_search import DDGS
+            _DDGS = DDGS()
+        return _DDGS
+
+
+def _drop_ddgs() -> None:
+    global _DDGS
+    with _CLIENTS_LOCK:
+        _DDGS = None
+
+
+def _get_http() -> Any:
+    global _HTTP
+    with _CLIENTS_LOCK:
+        if _HTTP is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _HTTP = requests.Session()
+            _HTTP.headers.update(_BROWSER_HEADERS)
+            # Searches for different queries can run concurrently (parallel
+            # read-only tool calls); keep a few warm connections per host.
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            _HTTP.mount("https://", adapter)
+            _HTTP.mount("http://", adapter)
+        return _HTTP
+
+
+def _get_openai(api_key: str) -> Any:
+    """One OpenAI client per key; it keeps its own pooled HTTP connections."""
+    with _CLIENTS_LOCK:
+        client = _OPENAI.get(api_key)
+        if client is None:
+            from openai import OpenAI
+            client = _OPENAI[api_key] = OpenAI(
+                api_key=api_key, timeout=_OPENAI_TIMEOUT_SEC, max_retries=_OPENAI_MAX_RETRIES,
+            )
+        return client
+
+
+def _reset_clients_after_fork() -> None:
+    # A forked child must not share the parent's sockets (or a held lock).
+    global _DDGS, _HTTP, _CLIENTS_LOCK, _SEARCH_CACHE_LOCK
+    _DDGS = None
+    _HTTP = None
+    _OPENAI.clear()
+    _CLIENTS_LOCK = threading.Lock()
+    _SEARCH_CACHE_LOCK = threading.Lock()
+    _INFLIGHT.clear()  # the parent's searches never finish in the child
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
+
 def _duckduckgo_search(query: str, num_results: int = 5) -> Dict[str, Any]:
     """
     Search via DuckDuckGo (free, no API key required).
@@ -105,10 +233,7 @@ def _duckduckgo_search(query: str, num_results: int = 5) -> Dict[str, Any]:
     Uses duckduckgo-search library for reliable results.
     """
     try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=num_results))
+        results = list(_get_ddgs().text(query, max_results=num_results))
         
         if not results:
             return {
@@ -117,17 +242,14 @@ def _duckduckgo_search(query: str, num_results: int = 5) -> Dict[str, Any]:
                 "method": "duckduckgo"
             }
         
-        # Format results
-        answer_parts = []
+        # Format results: sources and answer lines in one pass
         sources = []
-        
-        for i, r in enumerate(results[:num_results], 1):
+        answer_parts = []
+        for i, r in enumerate(islice(results, num_results), 1):
             title = r.get("title", "Untitled")
-            body = r.get("body", "")
-            url = r.get("href", "")
-            
-            answer_parts.append(f"{i}. **{title}**\n   {body[:200]}...")
-            sources.append({"title": title, "url": url, "snippet": body})
+            snippet = r.get("body", "")
+            sources.append({"title": title, "url": r.get("href", ""), "snippet": snippet})
+            answer_parts.append(_format_hit(i, title, snippet))
         
         return {
             "answer": f"Search results for: {query}\n\n" + "\n\n".join(answer_parts),
@@ -143,6 +265,7 @@ def _duckduckgo_search(query: str, num_results: int = 5) -> Dict[str, Any]:
             "method": "duckduckgo"
         }
     except Exception as e:
+        _drop_ddgs()  # don't keep reusing a session that just failed
         return {
             "error": f"DuckDuckGo search failed: {repr(e)}",
             "method": "duckduckgo"
@@ -154,15 +277,14 @@ def _openai_web_search(query: str, model: str = "gpt-4o") -> Dict[str, Any]:
     Search via OpenAI Chat Completions API with web_search tool.
     Requires OPENAI_API_KEY with search access.
     """
-    api_key = os.environ.get("OPENAI_API_KEY", "")
+    api_key = _search_config().openai_key
     
     if not api_key:
         return {"error": "OPENAI_API_KEY not set"}
     
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        
+        client = _get_openai(api_key)
+
         response = client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": query}],
@@ -190,44 +312,70 @@ def _openai_web_search(query: str, model: str = "gpt-4o") -> Dict[str, Any]:
         return {"error": f"OpenAI web_search failed: {repr(e)}", "method": "openai"}
 
 
+_GOOGLE_MAX_BYTES = 50000
+_GOOGLE_RESULT_LIMIT = 5
+
+
+def _google_redirect_target(href: str) -> str:
+    """Target of a Google /url?q=... result link ("" if it is not one)."""
+    parts = urlsplit(href)
+    if parts.path != "/url" or (parts.netloc and not parts.netloc.endswith("google.com")):
+        return ""
+    return parse_qs(parts.query).get("q", [""])[0]
+
+
+def _parse_google_results(html: str, limit: int = 5) -> List[Dict[str, str]]:
+    results: List[Dict[str, str]] = []
+    if _lxml_html is not None:
+        try:
+            root = _lxml_html.fromstring(html)
+        except Exception:
+            root = None
+        # Each organic result is an <a href="/url?q=..."> wrapping its <h3>,
+        # so title and URL come from the same node instead of being zipped.
+        for a in (root.xpath("//a[@href][.//h3]") if root is not None else ()):
+            url = _google_redirect_target(a.get("href", ""))
+            title = a.xpath("string(.//h3)").strip()
+            if url and title:
+                results.append({"title": title, "url": url})
+                if len(results) >= limit:
+                    break
+        if results:
+            return results
+    
+    titles = _GOOGLE_TITLE_RE.findall(html)
+    urls = [_google_redirect_target(unescape(href)) for href in _GOOGLE_URL_RE.findall(html)]
+    for title, url in zip(titles[:limit], urls[:limit]):
+        results.append({"title": unescape(title), "url": url})
+    return results
+
+
 def _browser_search(query: str) -> Dict[str, Any]:
     """
     Fallback: Search via browser (Google).
     This is a last resort when other methods fail.
     """
     try:
-        import requests
-        from urllib.parse import quote
-        
         # Use Google search and fetch the page
-        search_url = f"https://www.google.com/search?q={quote(query)}&num=5"
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
-        
-        resp = requests.get(search_url, headers=headers, timeout=10)
-        resp.raise_for_status()
+        search_url = f"https://www.google.com/search?q={quote(query)}&num={_GOOGLE_RESULT_LIMIT}"
         
-        # Extract basic info from HTML (simple parsing)
-        html = resp.text[:50000]  # Limit parsing
+        # Read (and decode) only the head of the page: results come first,
+        # so stop as soon as enough result headings have arrived.
+        with _get_http().get(search_url, timeout=10, stream=True) as resp:
+            resp.raise_for_status()
+            buf = bytearray()
+            headings = 0
+            for chunk in resp.iter_content(chunk_size=8192):
+                # Count only the new bytes (plus an overlap for a split tag).
+                start = max(0, len(buf) - 4)
+                buf += chunk
+                headings += buf.count(b"</h3>", start)
+                if len(buf) >= _GOOGLE_MAX_BYTES or headings >= _GOOGLE_RESULT_LIMIT:
+                    break
+            html = buf[:_GOOGLE_MAX_BYTES].decode(resp.encoding or "utf-8", errors="replace")
         
         # Look for search result titles and URLs
-        import re
-        results = []
-        
-        # Google search result pattern (simplified)
-        title_pattern = r'<h3[^>]*>([^<]+)</h3>'
-        url_pattern = r'href="https?://(www\.)?google\.com/url\?q=([^&]+)"'
-        
-        titles = re.findall(title_pattern, html)
-        urls = re.findall(url_pattern, html)
-        
-        for i, (title, (_, url)) in enumerate(zip(titles[:5], urls[:5]), 1):
-            # Unquote URL
-            from urllib.parse import unquote
-            clean_url = unquote(url.replace('+', ' '))
-            results.append({"title": title, "url": clean_url})
+        results = _parse_google_results(html, limit=_GOOGLE_RESULT_LIMIT)
         
         if results:
             answer_parts = [f"Search results for: {query}\n"]
@@ -246,6 +394,86 @@ def _browser_search(query: str) -> Dict[str, Any]:
         return {"error": f"Browser search failed: {repr(e)}", "method": "browser"}
 
 
+# Successful web_search results by normalized query -> (monotonic expiry, JSON).
+# Agents often repeat a query within a task; repeats skip every provider.
+# Expiries are jittered so a burst of queries doesn't all go stale at once.
+_SEARCH_CACHE_TTL_SEC = 10 * 60
+_SEARCH_CACHE_JITTER_SEC = 30
+_SEARCH_CACHE_MAX = 512
+_SEARCH_CACHE: Dict[str, Tuple[float, str]] = {}
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _cached_search(key: str) -> Optional[str]:
+    with _SEARCH_CACHE_LOCK:
+        hit = _SEARCH_CACHE.get(key)
+    if hit is not None and time.monotonic() < hit[0]:
+        return hit[1]
+    return None
+
+
+def _remember_search(key: str, result: str) -> str:
+    now = time.monotonic()
+    expires = now + _SEARCH_CACHE_TTL_SEC + random.uniform(-_SEARCH_CACHE_JITTER_SEC, _SEARCH_CACHE_JITTER_SEC)
+    with _SEARCH_CACHE_LOCK:
+        for k in [k for k, (exp, _) in _SEARCH_CACHE.items() if exp <= now]:
+            del _SEARCH_CACHE[k]
+        _SEARCH_CACHE.pop(key, None)
+        while len(_SEARCH_CACHE) >= _SEARCH_CACHE_MAX:
+            del _SEARCH_CACHE[next(iter(_SEARCH_CACHE))]  # oldest insert
+        _SEARCH_CACHE[key] = (expires, result)
+    return result
+
+
+# Queries currently being searched (normalized key -> done event), guarded by
+# _SEARCH_CACHE_LOCK.
+_INFLIGHT: Dict[str, threading.Event] = {}
+_INFLIGHT_WAIT_SEC = 60.0
+
+
+# Free/cheap providers raced in parallel; a higher-priority provider still
+# in flight gets this much extra time after a lower-priority one succeeds.
+_RACE_TIMEOUT_SEC = 30.0
+_RACE_GRACE_SEC = 1.0
+
+
+def _is_hit(result: Dict[str, Any]) -> bool:
+    return "error" not in result and result.get("result_count", 0) > 0
+
+
+def _race_providers(
+    providers: List[Tuple[str, Callable[[], Dict[str, Any]]]],
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Run providers concurrently; earlier entries win ties.
+
+    Returns (best successful result or None, {name: result} for those finished).
+    """
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="web_search")
+    try:
+        rank = {executor.submit(fn): i for i, (_, fn) in enumerate(providers)}
+        finished: Dict[int, Dict[str, Any]] = {}
+        pending = set(rank)
+        deadline = time.monotonic() + _RACE_TIMEOUT_SEC
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for fut in done:
+                finished[rank[fut]] = fut.result()  # providers catch their own errors
+            hits = [i for i, r in finished.items() if _is_hit(r)]
+            if hits:
+                best = min(hits)
+                if all(rank[fut] > best for fut in pending):
+                    break
+                deadline = min(deadline, time.monotonic() + _RACE_GRACE_SEC)
+        hits = [i for i, r in finished.items() if _is_hit(r)]
+        by_name = {providers[i][0]: r for i, r in finished.items()}
+        return (finished[min(hits)] if hits else None), by_name
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def _web_search(ctx: ToolContext, query: str) -> str:
     """
     Search the web using multiple methods with automatic fallback.
@@ -256,49 +484,82 @@ def _web_search(ctx: ToolContext, query: str) -> str:
     3. OpenAI web_search (FALLBACK) - requires OPENAI_API_KEY
     4. Browser Google search (LAST RESORT)
     
+    Tavily and DuckDuckGo run concurrently (Tavily preferred when both
+    succeed); the paid/scraping fallbacks only run if both miss.
+    
     Returns JSON with answer + sources.
     """
     if not query or not query.strip():
-        return json.dumps({"error": "Query is required"}, ensure_ascii=False)
+        return _dumps({"error": "Query is required"})
     
-    # Method 1: Tavily Search (PRIMARY - best for AI agents)
-    if os.environ.get("TAVILY_API_KEY"):
-        ctx.emit_progress_fn("🔍 Searching via Tavily API...")
-        result = _tavily_search(query, num_results=5)
-        
-        if "error" not in result and result.get("result_count", 0) > 0:
-            return json.dumps(result, ensure_ascii=False, indent=2)
-        ctx.emit_progress_fn(f"⚠️ Tavily failed: {result.get('error', 'unknown')}")
+    cache_key = " ".join(query.lower().split())
+    cached = _cached_search(cache_key)
+    if cached is not None:
+        ctx.emit_progress_fn("🔍 Search cache hit, skipping providers")
+        return cached
     
-    # Method 2: DuckDuckGo (free, no key)
-    ctx.emit_progress_fn("🔍 Searching via DuckDuckGo...")
-    result = _duckduckgo_search(query, num_results=5)
+    # Single flight: a concurrent identical query waits for the one already
+    # running and reuses its cached result instead of hitting providers twice.
+    with _SEARCH_CACHE_LOCK:
+        inflight = _INFLIGHT.get(cache_key)
+        if inflight is None:
+            _INFLIGHT[cache_key] = threading.Event()
+    if inflight is not None:
+        ctx.emit_progress_fn("🔍 Same search already running, waiting for it...")
+        inflight.wait(timeout=_INFLIGHT_WAIT_SEC)
+        cached = _cached_search(cache_key)
+        if cached is not None:
+            return cached
+        return _search_providers(ctx, query, cache_key)  # leader failed: try ourselves
+    try:
+        return _search_providers(ctx, query, cache_key)
+    finally:
+        with _SEARCH_CACHE_LOCK:
+            _INFLIGHT.pop(cache_key).set()
+
+
+def _search_providers(ctx: ToolContext, query: str, cache_key: str) -> str:
+    # Methods 1+2: Tavily (if key) and DuckDuckGo, raced
+    cfg = _search_config()
+    providers: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+    if cfg.tavily_key:
+        providers.append(("Tavily", lambda: _tavily_search(query, num_results=5)))
+    providers.append(("DuckDuckGo", lambda: _duckduckgo_search(query, num_results=5)))
+    ctx.emit_progress_fn(f"🔍 Searching via {' + '.join(name for name, _ in providers)}...")
+    result, attempts = _race_providers(providers)
     
-    if "error" not in result and result.get("result_count", 0) > 0:
-        return json.dumps(result, ensure_ascii=False, indent=2)
+    if result is not None:
+        return _remember_search(cache_key, _dumps(result))
+    for name, failed in attempts.items():
+        ctx.emit_progress_fn(f"⚠️ {name} failed: {failed.get('error', 'no results')}")
     
     # Method 3: OpenAI web_search (if key available)
-    if os.environ.get("OPENAI_API_KEY"):
-        ctx.emit_progress_fn("🔍 DuckDuckGo failed, trying OpenAI web_search...")
+    if cfg.openai_key:
+        ctx.emit_progress_fn("🔍 Trying OpenAI web_search...")
         result = _openai_web_search(query)
         
         if "error" not in result:
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return _remember_search(cache_key, _dumps(result))
     
     # Method 4: Browser search (LAST RESORT)
     ctx.emit_progress_fn("🔍 Falling back to browser search...")
     result = _browser_search(query)
     
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    if "error" not in result:
+        return _remember_search(cache_key, _dumps(result))
+    return _dumps(result)
+
+
+_TOOLS: List[ToolEntry] = [
+    ToolEntry("web_search", {
+        "name": "web_search",
+        "description": "Search the web with automatic fallback. Uses DuckDuckGo (free), OpenAI (if key set), or browser. Returns JSON with answer + sources.",
+        "parameters": {"type": "object", "properties": {
+            "query": {"type": "string", "description": "Search query"},
+        }, "required": ["query"]},
+    }, _web_search),
+]
 
 
 def get_tools() -> List[ToolEntry]:
-    return [
-        ToolEntry("web_search", {
-            "name": "web_search",
-            "description": "Search the web with automatic fallback. Uses DuckDuckGo (free), OpenAI (if key set), or browser. Returns JSON with answer + sources.",
-            "parameters": {"type": "object", "properties": {
-                "query": {"type": "string", "description": "Search query"},
-            }, "required": ["query"]},
-        }, _web_search),
-    ]
+    return list(_TOOLS)
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import atexit
+import collections
+import functools
 import json
 import logging
 import os
@@ -9,54 +12,147 @@ import pathlib
 import shlex
 import shutil
 import subprocess
-from typing import Any, Dict, List
+import tempfile
+import threading
+from typing import Any, Dict, List, Tuple
 
 from ouroboros.tools.registry import ToolContext, ToolEntry
 from ouroboros.utils import utc_now_iso, run_cmd, append_jsonl, truncate_for_log
 
 log = logging.getLogger(__name__)
 
+# Warning events are queued here and written by a background thread, so a
+# slow Drive append never delays the command itself.
+_LOG_BUF: "collections.deque[Tuple[pathlib.Path, Dict[str, Any]]]" = collections.deque()
+_LOG_WAKE = threading.Event()
+_LOG_THREAD: threading.Thread | None = None
+_LOG_THREAD_LOCK = threading.Lock()
 
-def _run_shell(ctx: ToolContext, cmd, cwd: str = "") -> str:
-    # Recover from LLM sending cmd as JSON string instead of list
-    if isinstance(cmd, str):
-        raw_cmd = cmd
-        warning = "run_shell_cmd_string"
-        try:
-            parsed = json.loads(cmd)
-            if isinstance(parsed, list):
-                cmd = parsed
-                warning = "run_shell_cmd_string_json_list_recovered"
-            elif isinstance(parsed, str):
-                try:
-                    cmd = shlex.split(parsed)
-                except ValueError:
-                    cmd = parsed.split()
-                warning = "run_shell_cmd_string_json_string_split"
-            else:
-                try:
-                    cmd = shlex.split(cmd)
-                except ValueError:
-                    cmd = cmd.split()
-                warning = "run_shell_cmd_string_json_non_list_split"
-        except Exception:
-            try:
-                cmd = shlex.split(cmd)
-            except ValueError:
-                cmd = cmd.split()
-            warning = "run_shell_cmd_string_split_fallback"
 
+def _drain_log_buf() -> None:
+    # Runs on the writer thread and from atexit at once: pop, don't check-then-pop.
+    while True:
+        try:
+            path, event = _LOG_BUF.popleft()
+        except IndexError:
+            break
         try:
-            append_jsonl(ctx.drive_logs() / "events.jsonl", {
-                "ts": utc_now_iso(),
-                "type": "tool_warning",
-                "tool": "run_shell",
-                "warning": warning,
-                "cmd_preview": truncate_for_log(raw_cmd, 500),
-            })
+            append_jsonl(path, event)
         except Exception:
             log.debug("Failed to log run_shell warning to events.jsonl", exc_info=True)
+
+
+def _log_writer() -> None:
+    while True:
+        _LOG_WAKE.wait()
+        _LOG_WAKE.clear()
+        _drain_log_buf()
+
+
+def _log_event(path: pathlib.Path, event: Dict[str, Any]) -> None:
+    global _LOG_THREAD
+    _LOG_BUF.append((path, event))
+    if _LOG_THREAD is None:
+        with _LOG_THREAD_LOCK:
+            if _LOG_THREAD is None:
+                _LOG_THREAD = threading.Thread(target=_log_writer, name="shell-log-writer", daemon=True)
+                _LOG_THREAD.start()
+    _LOG_WAKE.set()
+
+
+atexit.register(_drain_log_buf)
+
+
+def _reset_log_writer_after_fork() -> None:
+    global _LOG_THREAD, _LOG_THREAD_LOCK, _LOG_WAKE
+    _LOG_THREAD = None
+    _LOG_THREAD_LOCK = threading.Lock()
+    _LOG_WAKE = threading.Event()
+    _LOG_BUF.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_log_writer_after_fork)
+
+
+_OUTPUT_LIMIT = 50000
+_OUTPUT_HALF = _OUTPUT_LIMIT // 2
+_STDERR_SEP = b"\n--- STDERR ---\n"
+
+
+def _read_span(out_f, out_size: int, sep: bytes, err_f, start: int, n: int) -> bytes:
+    """Bytes [start, start+n) of the virtual stream stdout + sep + stderr."""
+    end = start + n
+    parts = []
+    if start < out_size:
+        out_f.seek(start)
+        parts.append(out_f.read(min(end, out_size) - start))
+    sep_start, sep_end = out_size, out_size + len(sep)
+    lo, hi = max(start, sep_start), min(end, sep_end)
+    if lo < hi:
+        parts.append(sep[lo - sep_start:hi - sep_start])
+    lo = max(start, sep_end)
+    if lo < end:
+        err_f.seek(lo - sep_end)
+        parts.append(err_f.read(end - lo))
+    return b"".join(parts)
+
+
+def _read_captured(out_f, err_f) -> str:
+    """Combined stdout/stderr text; large outputs keep only head and tail.
+
+    The middle of a huge log is never read or decoded.
+    """
+    out_size = os.fstat(out_f.fileno()).st_size
+    err_size = os.fstat(err_f.fileno()).st_size
+    sep = _STDERR_SEP if err_size else b""
+    total = out_size + len(sep) + err_size
+    if total <= _OUTPUT_LIMIT:
+        return _read_span(out_f, out_size, sep, err_f, 0, total).decode("utf-8", "replace")
+    head = _read_span(out_f, out_size, sep, err_f, 0, _OUTPUT_HALF)
+    tail = _read_span(out_f, out_size, sep, err_f, total - _OUTPUT_HALF, _OUTPUT_HALF)
+    return head.decode("utf-8", "replace") + "\n...(truncated)...\n" + tail.decode("utf-8", "replace")
+
+
+@functools.lru_cache(maxsize=256)
+def _split_cmd(cmd: str) -> Tuple[str, ...]:
+    try:
+        return tuple(shlex.split(cmd))
+    except ValueError:
+        return tuple(cmd.split())
+
+
+def _recover_cmd(cmd: str) -> Tuple[List[Any], str]:
+    """Turn a string cmd into an argv list; returns (argv, warning tag).
+
+    Only strings that look like JSON (a list or a quoted string) go through
+    json.loads; plain shell strings are split directly.
+    """
+    if cmd.lstrip().startswith(("[", '"')):
+        try:
+            parsed = json.loads(cmd)
+        except ValueError:
             pass
+        else:
+            if isinstance(parsed, list):
+                return parsed, "run_shell_cmd_string_json_list_recovered"
+            if isinstance(parsed, str):
+                return list(_split_cmd(parsed)), "run_shell_cmd_string_json_string_split"
+    return list(_split_cmd(cmd)), "run_shell_cmd_string_split_fallback"
+
+
+def _run_shell(ctx: ToolContext, cmd, cwd: str = "") -> str:
+    # Recover from LLM sending cmd as JSON string instead of list
+    if isinstance(cmd, str):
+        raw_cmd = cmd
+        cmd, warning = _recover_cmd(cmd)
+        _log_event(ctx.drive_logs() / "events.jsonl", {
+            "ts": utc_now_iso(),
+            "type": "tool_warning",
+            "tool": "run_shell",
+            "warning": warning,
+            "cmd_preview": truncate_for_log(raw_cmd, 500),
+        })
 
     if not isinstance(cmd, list):
         return "⚠️ SHELL_ARG_ERROR: cmd must be a list of strings."
@@ -69,13 +165,15 @@ def _run_shell(ctx: ToolContext, cmd, cwd: str = "") -> str:
             work_dir = candidate
 
     try:
-        res = subprocess.run(
-            cmd, cwd=str(work_dir),
-            capture_output=True, text=True, timeout=120,
-        )
-        out = res.stdout + ("\n--- STDERR ---\n" + res.stderr if res.stderr else "")
-        if len(out) > 50000:
-            out = out[:25000] + "\n...(truncated)...\n" + out[-25000:]
+        # Capture straight into temp files: no pipe reader threads, one read
+        # per stream afterwards. (A SpooledTemporaryFile would be rolled over
+        # to disk anyway, since the child needs a real file descriptor.)
+        with tempfile.TemporaryFile() as out_f, tempfile.TemporaryFile() as err_f:
+            res = subprocess.run(
+                cmd, cwd=str(work_dir),
+                stdout=out_f, stderr=err_f, timeout=120,
+            )
+            out = _read_captured(out_f, err_f)
         prefix = f"exit_code={res.returncode}\n"
         return prefix + out
     except subprocess.TimeoutExpired:
@@ -84,12 +182,22 @@ def _run_shell(ctx: ToolContext, cmd, cwd: str = "") -> str:
         return f"⚠️ SHELL_ERROR: {e}"
 
 
+@functools.lru_cache(maxsize=1)
+def _resolve_qwen() -> str | None:
+    """Path to the qwen CLI, looked up on PATH once per process."""
+    return shutil.which("qwen")
+
+
 def _run_qwen_cli(work_dir: str, prompt: str, env: dict) -> subprocess.CompletedProcess:
     """Run Qwen CLI for code editing."""
     # Using the exact model ID for iFlow: Qwen3-Coder-Plus (or Qwen3-Coder-480B-A35B-Instruct)
     # The user found it on the iFlow model platform.
-    qwen_bin = shutil.which("qwen")
-    
+    qwen_bin = _resolve_qwen()
+    if not qwen_bin:
+        # Not found last time; PATH may have changed since (e.g. CLI just installed).
+        _resolve_qwen.cache_clear()
+        qwen_bin = _resolve_qwen()
+
     if not qwen_bin:
         return subprocess.CompletedProcess(
             args=["qwen"], returncode=127, stdout="", 
@@ -99,10 +207,14 @@ def _run_qwen_cli(work_dir: str, prompt: str, env: dict) -> subprocess.Completed
     # Calling qwen with the specific model for code editing
     cmd = [qwen_bin, "edit", "--model", "Qwen3-Coder-Plus", "--prompt", prompt, "--path", work_dir]
 
-    res = subprocess.run(
-        cmd, cwd=work_dir,
-        capture_output=True, text=True, timeout=300, env=env,
-    )
+    try:
+        res = subprocess.run(
+            cmd, cwd=work_dir,
+            capture_output=True, text=True, timeout=300, env=env,
+        )
+    except FileNotFoundError:
+        _resolve_qwen.cache_clear()
+        raise
     return res
 
 
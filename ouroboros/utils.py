@@ -36,10 +36,54 @@ def sha256_text(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
+# ---------------------------------------------------------------------------
+# JSON (orjson when installed, stdlib otherwise)
+# ---------------------------------------------------------------------------
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def json_dumpb(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (non-ASCII kept as-is)."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj)
+        except TypeError:
+            log.debug("orjson cannot serialize object, falling back to stdlib json", exc_info=True)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
 # ---------------------------------------------------------------------------
 # File I/O
 # ---------------------------------------------------------------------------
 
+# Directories already created by this process (skips repeated Drive mkdirs).
+_ENSURED_DIRS: set = set()
+
+
+def ensure_dir(path: pathlib.Path) -> None:
+    """mkdir -p, but only the first time per process for a given directory."""
+    if path in _ENSURED_DIRS:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(path)
+
+
+def forget_dir(path: pathlib.Path) -> None:
+    """Drop a directory from the ensure_dir cache (e.g. after a failed write)."""
+    _ENSURED_DIRS.discard(path)
+
+
 def read_text(path: pathlib.Path) -> str:
     return path.read_text(encoding="utf-8")
 
@@ -52,8 +96,7 @@ def write_text(path: pathlib.Path, content: str) -> None:
 def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> None:
     """Append a JSON object as a line to a JSONL file (concurrent-safe)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    line = json.dumps(obj, ensure_ascii=False)
-    data = (line + "\n").encode("utf-8")
+    data = json_dumpb(obj) + b"\n"
 
     lock_timeout_sec = 2.0
     lock_stale_sec = 10.0
@@ -101,8 +144,8 @@ def append_jsonl(path: pathlib.Path, obj: Dict[str, Any]) -> None:
 
         for attempt in range(write_retries):
             try:
-                with path.open("a", encoding="utf-8") as f:
-                    f.write(line + "\n")
+                with path.open("ab") as f:
+                    f.write(data)
                 return
             except Exception:
                 if attempt < write_retries - 1:
@@ -7,7 +7,6 @@ Extracted from colab_launcher.py main loop to keep it under 500 lines.
 
 from __future__ import annotations
 
-import datetime
 import json
 import logging
 import os
@@ -16,6 +15,8 @@ import time
 import uuid
 from typing import Any, Dict, Optional
 
+from supervisor.state import iso_now
+
 # Lazy imports to avoid circular dependencies — everything comes through ctx
 
 log = logging.getLogger(__name__)
@@ -45,13 +46,12 @@ def _handle_llm_usage(evt: Dict[str, Any], ctx: Any) -> None:
 
 def _handle_task_heartbeat(evt: Dict[str, Any], ctx: Any) -> None:
     task_id = str(evt.get("task_id") or "")
-    if task_id and task_id in ctx.RUNNING:
-        meta = ctx.RUNNING.get(task_id) or {}
-        meta["last_heartbeat_at"] = time.time()
+    meta = ctx.RUNNING.get(task_id) if task_id else None
+    if meta is not None:
+        meta.last_heartbeat_at = time.monotonic()
         phase = str(evt.get("phase") or "")
         if phase:
-            meta["heartbeat_phase"] = phase
-        ctx.RUNNING[task_id] = meta
+            meta.heartbeat_phase = phase
 
 
 def _handle_typing_start(evt: Dict[str, Any], ctx: Any) -> None:
@@ -80,7 +80,7 @@ def _handle_send_message(evt: Dict[str, Any], ctx: Any) -> None:
         ctx.append_jsonl(
             ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "send_message_event_error", "error": repr(e),
             },
         )
@@ -115,7 +115,7 @@ def _handle_task_done(evt: Dict[str, Any], ctx: Any) -> None:
             ctx.append_jsonl(
                 ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": iso_now(),
                     "type": "evolution_task_failure_tracked",
                     "task_id": task_id,
                     "consecutive_failures": failures,
@@ -156,7 +156,7 @@ def _handle_task_metrics(evt: Dict[str, Any], ctx: Any) -> None:
     ctx.append_jsonl(
         ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
         {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": iso_now(),
             "type": "task_metrics_event",
             "task_id": str(evt.get("task_id") or ""),
             "task_type": str(evt.get("task_type") or ""),
@@ -193,7 +193,7 @@ def _handle_restart_request(evt: Dict[str, Any], ctx: Any) -> None:
     st2["session_id"] = uuid.uuid4().hex
     st2["tg_offset"] = int(st2.get("tg_offset") or st.get("tg_offset") or 0)
     ctx.save_state(st2)
-    ctx.persist_queue_snapshot(reason="pre_restart_exit")
+    ctx.persist_queue_snapshot(reason="pre_restart_exit", force=True)
     # Replace current process with fresh Python — loads all modules from scratch
     launcher = os.path.join(os.getcwd(), "colab_launcher.py")
     os.execv(sys.executable, [sys.executable, launcher])
@@ -241,9 +241,7 @@ def _find_duplicate_task(desc: str, pending: list, running: dict) -> Optional[st
         if text.strip():
             existing.append({"id": task.get("id", "?"), "text": text[:200]})
     for task_id, meta in running.items():
-        task_data = meta.get("task") if isinstance(meta, dict) else None
-        if not isinstance(task_data, dict):
-            continue
+        task_data = meta.task
         text = str(task_data.get("text") or task_data.get("description") or "")
         if text.strip():
             existing.append({"id": task_id, "text": text[:200]})
@@ -313,7 +311,7 @@ def _handle_schedule_task(evt: Dict[str, Any], ctx: Any) -> None:
         task = {"id": tid, "type": "task", "chat_id": int(owner_chat_id), "text": text, "depth": depth}
         if parent_id:
             task["parent_task_id"] = parent_id
-        ctx.enqueue_task(task)
+        ctx.enqueue_task(task, inplace=True)
         ctx.send_with_budget(int(owner_chat_id), f"🗓️ Scheduled task {tid}: {desc}")
         ctx.persist_queue_snapshot(reason="schedule_task_event")
 
@@ -375,7 +373,7 @@ def _handle_send_photo(evt: Dict[str, Any], ctx: Any) -> None:
             ctx.append_jsonl(
                 ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": iso_now(),
                     "type": "send_photo_error",
                     "chat_id": chat_id, "error": err,
                 },
@@ -384,7 +382,7 @@ def _handle_send_photo(evt: Dict[str, Any], ctx: Any) -> None:
         ctx.append_jsonl(
             ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "send_photo_event_error", "error": repr(e),
             },
         )
@@ -432,7 +430,7 @@ def dispatch_event(evt: Dict[str, Any], ctx: Any) -> None:
         ctx.append_jsonl(
             ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "invalid_worker_event",
                 "error": "event is not dict",
                 "event_repr": repr(evt)[:1000],
@@ -445,7 +443,7 @@ def dispatch_event(evt: Dict[str, Any], ctx: Any) -> None:
         ctx.append_jsonl(
             ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "invalid_worker_event",
                 "error": "missing event.type",
                 "event_repr": repr(evt)[:1000],
@@ -458,7 +456,7 @@ def dispatch_event(evt: Dict[str, Any], ctx: Any) -> None:
         ctx.append_jsonl(
             ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "unknown_worker_event",
                 "event_type": event_type,
                 "event_repr": repr(evt)[:1000],
@@ -472,7 +470,7 @@ def dispatch_event(evt: Dict[str, Any], ctx: Any) -> None:
         ctx.append_jsonl(
             ctx.DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "worker_event_handler_error",
                 "event_type": event_type,
                 "error": repr(e),
@@ -18,7 +18,7 @@ import uuid
 from typing import Any, Dict, List, Optional, Tuple
 
 from supervisor.state import (
-    load_state, save_state, append_jsonl, atomic_write_text,
+    load_state, save_state, append_jsonl, atomic_write_text, iso_now,
 )
 
 log = logging.getLogger(__name__)
@@ -213,7 +213,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "reset_fetch_failed",
                 "target_branch": branch, "reason": reason, "error": msg,
             },
@@ -254,7 +254,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
                 append_jsonl(
                     DRIVE_ROOT / "logs" / "supervisor.jsonl",
                     {
-                        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                        "ts": iso_now(),
                         "type": "reset_blocked_unsynced_state",
                         "target_branch": branch, "reason": reason, "policy": policy,
                         "current_branch": repo_state.get("current_branch"),
@@ -271,7 +271,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": iso_now(),
                     "type": "reset_unsynced_rescued_then_reset",
                     "target_branch": branch, "reason": reason, "policy": policy,
                     "current_branch": repo_state.get("current_branch"),
@@ -293,7 +293,7 @@ def checkout_and_reset(branch: str, reason: str = "unspecified",
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "reset_branch_missing",
                 "target_branch": branch, "reason": reason,
             },
@@ -334,7 +334,7 @@ def sync_runtime_dependencies(reason: str) -> Tuple[bool, str]:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "deps_sync_ok", "reason": reason, "source": source,
             },
         )
@@ -344,7 +344,7 @@ def sync_runtime_dependencies(reason: str) -> Tuple[bool, str]:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "deps_sync_error", "reason": reason, "source": source, "error": msg,
             },
         )
@@ -399,7 +399,7 @@ def safe_restart(
     append_jsonl(
         DRIVE_ROOT / "logs" / "supervisor.jsonl",
         {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": iso_now(),
             "type": "safe_restart_dev_import_failed",
             "reason": reason,
             "branch": BRANCH_DEV,
@@ -6,20 +6,25 @@ Queue operations, priority, timeouts, persistence, evolution/review scheduling.
 
 from __future__ import annotations
 
+import atexit
+import bisect
 import datetime
 import json
 import logging
 import pathlib
+import queue as _queue_mod
 import threading
 import time
 import uuid
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 from supervisor.state import (
-    load_state, save_state, append_jsonl, atomic_write_text,
+    load_state, save_state, append_jsonl, atomic_write_bytes, iso_now,
     QUEUE_SNAPSHOT_PATH, budget_pct, TOTAL_BUDGET_LIMIT,
 )
 from supervisor.telegram import send_with_budget
+from ouroboros.utils import json_dumpb
 
 log = logging.getLogger(__name__)
 
@@ -44,9 +49,24 @@ def init(drive_root: pathlib.Path, soft_timeout: int, hard_timeout: int) -> None
 # ---------------------------------------------------------------------------
 # Queue data structures (references to workers module globals)
 # ---------------------------------------------------------------------------
+@dataclass(slots=True)
+class RunMeta:
+    """Bookkeeping for a task assigned to a worker (a RUNNING value).
+
+    Timestamps are time.monotonic().
+    """
+    task: Dict[str, Any]
+    worker_id: int
+    started_at: float
+    last_heartbeat_at: float
+    attempt: int = 1
+    soft_sent: bool = False
+    heartbeat_phase: str = ""
+
+
 # These will be set by workers.init_queue_refs()
 PENDING: List[Dict[str, Any]] = []
-RUNNING: Dict[str, Dict[str, Any]] = {}
+RUNNING: Dict[str, RunMeta] = {}
 QUEUE_SEQ_COUNTER_REF: Dict[str, int] = {"value": 0}
 
 # Lock for all mutations to PENDING, RUNNING, WORKERS shared collections.
@@ -54,7 +74,7 @@ QUEUE_SEQ_COUNTER_REF: Dict[str, int] = {"value": 0}
 _queue_lock = threading.Lock()
 
 
-def init_queue_refs(pending: List[Dict[str, Any]], running: Dict[str, Dict[str, Any]],
+def init_queue_refs(pending: List[Dict[str, Any]], running: Dict[str, RunMeta],
                     seq_counter_ref: Dict[str, int]) -> None:
     """Called by workers.py to provide references to queue data structures."""
     global PENDING, RUNNING, QUEUE_SEQ_COUNTER_REF
@@ -67,13 +87,14 @@ def init_queue_refs(pending: List[Dict[str, Any]], running: Dict[str, Dict[str,
 # Queue priority
 # ---------------------------------------------------------------------------
 
+_TASK_PRIORITY = {"task": 0, "review": 0, "evolution": 1}
+
+
 def _task_priority(task_type: str) -> int:
-    t = str(task_type or "").strip().lower()
-    if t in ("task", "review"):
-        return 0
-    if t == "evolution":
-        return 1
-    return 2
+    pr = _TASK_PRIORITY.get(task_type)  # types set in code are already clean
+    if pr is None:
+        pr = _TASK_PRIORITY.get(str(task_type or "").strip().lower(), 2)
+    return pr
 
 
 def _queue_sort_key(task: Dict[str, Any]) -> Tuple[int, int]:
@@ -93,35 +114,153 @@ def sort_pending() -> None:
 # Queue operations
 # ---------------------------------------------------------------------------
 
-def enqueue_task(task: Dict[str, Any], front: bool = False) -> Dict[str, Any]:
-    """Add task to PENDING queue."""
-    t = dict(task)
+def _prepare_queued_task(task: Dict[str, Any], front: bool, queued_at: str,
+                         inplace: bool = False) -> Dict[str, Any]:
+    t = task if inplace else dict(task)
     QUEUE_SEQ_COUNTER_REF["value"] += 1
     seq = QUEUE_SEQ_COUNTER_REF["value"]
     t.setdefault("priority", _task_priority(str(t.get("type") or "")))
     _att = t.get("_attempt")
     t.setdefault("_attempt", int(_att) if _att is not None else 1)
     t["_queue_seq"] = -seq if front else seq
-    t["queued_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    PENDING.append(t)
-    sort_pending()
+    t["queued_at"] = queued_at
+    return t
+
+
+def enqueue_task(task: Dict[str, Any], front: bool = False, inplace: bool = False) -> Dict[str, Any]:
+    """Add task to PENDING queue.
+
+    The task is copied unless inplace=True, for callers that hand over a dict
+    nothing else references (a fresh literal or an already-made copy).
+    """
+    t = _prepare_queued_task(task, front, iso_now(), inplace)
+    # PENDING is kept sorted, so a binary-search insert replaces a full re-sort.
+    bisect.insort(PENDING, t, key=_queue_sort_key)
     return t
 
 
+def enqueue_tasks_bulk(tasks: List[Dict[str, Any]], front: bool = False) -> List[Dict[str, Any]]:
+    """Add several tasks to PENDING, sorting the queue once instead of per task."""
+    if not tasks:
+        return []
+    queued_at = iso_now()
+    added = [_prepare_queued_task(task, front, queued_at) for task in tasks]
+    PENDING.extend(added)
+    sort_pending()
+    return added
+
+
 def queue_has_task_type(task_type: str) -> bool:
     """Check if a task of given type exists in PENDING or RUNNING."""
     tt = str(task_type or "")
     if any(str(t.get("type") or "") == tt for t in PENDING):
         return True
     for meta in RUNNING.values():
-        task = meta.get("task") if isinstance(meta, dict) else None
-        if isinstance(task, dict) and str(task.get("type") or "") == tt:
+        if str(meta.task.get("type") or "") == tt:
             return True
     return False
 
 
-def persist_queue_snapshot(reason: str = "") -> None:
-    """Save PENDING and RUNNING to snapshot file."""
+# Compact bytes (orjson when installed) go straight to atomic_write_bytes;
+# the snapshot is machine-read, so no indentation.
+_encode_snapshot = json_dumpb
+
+# The main loop persists every tick and queue events persist on top of that.
+# Every call encodes the current state, but the writer thread writes at most
+# once per _SNAPSHOT_MIN_INTERVAL_SEC and always the newest payload, so a
+# change reaches disk within about that interval even if no call follows it.
+_SNAPSHOT_MIN_INTERVAL_SEC = 1.0
+_LAST_SNAPSHOT_TS = 0.0  # monotonic time of the last write
+# Reasons of calls whose state may not be on disk yet (insertion-ordered set).
+_DEFERRED_SNAPSHOT_REASONS: Dict[str, None] = {}
+
+# Snapshots are fsynced to Drive by a writer thread so the main loop never
+# waits on disk. The queue holds only the newest (seq, bytes): a payload the
+# writer has not picked up yet is replaced, not queued behind.
+_SNAPSHOT_Q: "_queue_mod.Queue[Tuple[int, bytes]]" = _queue_mod.Queue(maxsize=1)
+_SNAPSHOT_PUT_LOCK = threading.Lock()
+_SNAPSHOT_WRITE_LOCK = threading.Lock()  # orders writer-thread and forced writes
+_SNAPSHOT_SEQ = 0
+_SNAPSHOT_WRITTEN_SEQ = 0
+_SNAPSHOT_THREAD: Optional[threading.Thread] = None
+
+
+def _write_snapshot(seq: int, data: bytes) -> None:
+    global _SNAPSHOT_WRITTEN_SEQ, _LAST_SNAPSHOT_TS
+    with _SNAPSHOT_WRITE_LOCK:
+        if seq <= _SNAPSHOT_WRITTEN_SEQ:
+            return  # a newer snapshot is already on disk
+        try:
+            atomic_write_bytes(QUEUE_SNAPSHOT_PATH, data)
+        except Exception:
+            log.warning("Failed to persist queue snapshot", exc_info=True)
+            return
+        _SNAPSHOT_WRITTEN_SEQ = seq
+        _LAST_SNAPSHOT_TS = time.monotonic()
+        with _SNAPSHOT_PUT_LOCK:
+            if seq == _SNAPSHOT_SEQ:  # nothing newer submitted meanwhile
+                _DEFERRED_SNAPSHOT_REASONS.clear()
+
+
+def _snapshot_writer() -> None:
+    while True:
+        item = _SNAPSHOT_Q.get()
+        wait_sec = _LAST_SNAPSHOT_TS + _SNAPSHOT_MIN_INTERVAL_SEC - time.monotonic()
+        if wait_sec > 0:
+            time.sleep(wait_sec)
+            try:
+                item = _SNAPSHOT_Q.get_nowait()  # newer state arrived meanwhile
+            except _queue_mod.Empty:
+                pass
+        _write_snapshot(*item)
+
+
+def _next_snapshot_seq() -> int:
+    global _SNAPSHOT_SEQ
+    _SNAPSHOT_SEQ += 1
+    return _SNAPSHOT_SEQ
+
+
+def _submit_snapshot(data: bytes) -> None:
+    global _SNAPSHOT_THREAD
+    with _SNAPSHOT_PUT_LOCK:
+        seq = _next_snapshot_seq()
+        if _SNAPSHOT_THREAD is None or not _SNAPSHOT_THREAD.is_alive():
+            _SNAPSHOT_THREAD = threading.Thread(
+                target=_snapshot_writer, name="queue-snapshot-writer", daemon=True)
+            _SNAPSHOT_THREAD.start()
+        try:
+            _SNAPSHOT_Q.get_nowait()
+        except _queue_mod.Empty:
+            pass
+        _SNAPSHOT_Q.put_nowait((seq, data))
+
+
+@atexit.register
+def flush_queue_snapshot() -> None:
+    """Write queue state the writer thread has not put on disk yet (shutdown path).
+
+    Deferred reasons stay set until the newest state is written, so they
+    cover both a payload still queued and one the writer holds while it
+    waits out the interval.
+    """
+    if _DEFERRED_SNAPSHOT_REASONS:
+        persist_queue_snapshot(reason="shutdown", force=True)
+
+
+def persist_queue_snapshot(reason: str = "", force: bool = False) -> None:
+    """Save PENDING and RUNNING to snapshot file.
+
+    The file is written by a background thread, at most once per
+    _SNAPSHOT_MIN_INTERVAL_SEC; the newest state always gets written, and
+    its reason lists every call since the last write. force=True writes
+    inline and at once (callers are about to kill workers or replace the
+    process).
+    """
+    with _SNAPSHOT_PUT_LOCK:
+        _DEFERRED_SNAPSHOT_REASONS[reason] = None
+        reason = "+".join(r for r in _DEFERRED_SNAPSHOT_REASONS if r)
+
     pending_rows = []
     for t in PENDING:
         pending_rows.append({
@@ -136,29 +275,33 @@ def persist_queue_snapshot(reason: str = "") -> None:
             },
         })
     running_rows = []
-    now = time.time()
+    now = time.monotonic()
     for task_id, meta in RUNNING.items():
-        task = meta.get("task") if isinstance(meta, dict) else {}
-        started = float(meta.get("started_at") or 0.0) if isinstance(meta, dict) else 0.0
-        hb = float(meta.get("last_heartbeat_at") or 0.0) if isinstance(meta, dict) else 0.0
+        task = meta.task
         running_rows.append({
             "id": task_id, "type": task.get("type"), "priority": task.get("priority"),
-            "attempt": meta.get("attempt"), "worker_id": meta.get("worker_id"),
-            "runtime_sec": round(max(0.0, now - started), 2) if started > 0 else 0.0,
-            "heartbeat_lag_sec": round(max(0.0, now - hb), 2) if hb > 0 else None,
-            "soft_sent": bool(meta.get("soft_sent")), "task": task,
+            "attempt": meta.attempt, "worker_id": meta.worker_id,
+            "runtime_sec": round(max(0.0, now - meta.started_at), 2),
+            "heartbeat_lag_sec": round(max(0.0, now - meta.last_heartbeat_at), 2),
+            "soft_sent": meta.soft_sent, "task": task,
         })
     payload = {
-        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "ts": iso_now(),
         "reason": reason,
         "pending_count": len(PENDING), "running_count": len(RUNNING),
         "pending": pending_rows, "running": running_rows,
     }
     try:
-        atomic_write_text(QUEUE_SNAPSHOT_PATH, json.dumps(payload, ensure_ascii=False, indent=2))
+        data = _encode_snapshot(payload)
     except Exception:
-        log.warning("Failed to persist queue snapshot (reason=%s)", reason, exc_info=True)
-        pass
+        log.warning("Failed to encode queue snapshot (reason=%s)", reason, exc_info=True)
+        return
+    if force:
+        with _SNAPSHOT_PUT_LOCK:
+            seq = _next_snapshot_seq()
+        _write_snapshot(seq, data)
+    else:
+        _submit_snapshot(data)
 
 
 def parse_iso_to_ts(iso_ts: str) -> Optional[float]:
@@ -189,20 +332,20 @@ def restore_pending_from_snapshot(max_age_sec: int = 900) -> int:
             return 0
         if (time.time() - ts_unix) > max_age_sec:
             return 0
-        restored = 0
+        to_restore = []
         for row in (snap.get("pending") or []):
             task = row.get("task") if isinstance(row, dict) else None
             if not isinstance(task, dict):
                 continue
             if not task.get("id") or not task.get("chat_id"):
                 continue
-            enqueue_task(task)
-            restored += 1
+            to_restore.append(task)
+        restored = len(enqueue_tasks_bulk(to_restore))
         if restored > 0:
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": iso_now(),
                     "type": "queue_restored_from_snapshot",
                     "restored_pending": restored,
                 },
@@ -220,22 +363,27 @@ def cancel_task_by_id(task_id: str) -> bool:
     from supervisor import workers
 
     with _queue_lock:
-        for i, t in enumerate(list(PENDING)):
+        # No copy needed: we stop iterating as soon as we pop.
+        for i, t in enumerate(PENDING):
             if t["id"] == task_id:
-                PENDING.pop(i)
+                del PENDING[i]
                 persist_queue_snapshot(reason="cancel_pending")
                 return True
 
-        # For RUNNING tasks, need to terminate worker
-        for w in workers.WORKERS.values():
-            if w.busy_task_id == task_id:
-                RUNNING.pop(task_id, None)
-                if w.proc.is_alive():
-                    w.proc.terminate()
-                w.proc.join(timeout=5)
-                workers.respawn_worker(w.wid)
-                persist_queue_snapshot(reason="cancel_running")
-                return True
+        # For RUNNING tasks, need to terminate worker. RunMeta knows the
+        # worker; the scan only covers a worker RUNNING lost track of.
+        meta = RUNNING.get(task_id)
+        w = workers.WORKERS.get(meta.worker_id) if meta is not None else None
+        if w is None or w.busy_task_id != task_id:
+            w = next((w for w in workers.WORKERS.values() if w.busy_task_id == task_id), None)
+        if w is not None:
+            RUNNING.pop(task_id, None)
+            if w.proc.is_alive():
+                w.proc.terminate()
+            w.proc.join(timeout=5)
+            workers.respawn_worker(w.wid)
+            persist_queue_snapshot(reason="cancel_running")
+            return True
     return False
 
 
@@ -250,31 +398,25 @@ def enforce_task_timeouts() -> None:
     
     if not RUNNING:
         return
-    now = time.time()
+    now = time.monotonic()
     st = load_state()
     owner_chat_id = int(st.get("owner_chat_id") or 0)
 
+    first_limit = min(SOFT_TIMEOUT_SEC, HARD_TIMEOUT_SEC)
+
     for task_id, meta in list(RUNNING.items()):
-        if not isinstance(meta, dict):
-            continue
-        task = meta.get("task") if isinstance(meta.get("task"), dict) else {}
-        started_at = float(meta.get("started_at") or 0.0)
-        if started_at <= 0:
-            continue
-        last_hb = float(meta.get("last_heartbeat_at") or started_at)
-        runtime_sec = max(0.0, now - started_at)
-        hb_lag_sec = max(0.0, now - last_hb)
+        runtime_sec = max(0.0, now - meta.started_at)
+        if runtime_sec < first_limit:
+            continue  # the common case: nothing to check below
+        task = meta.task
+        hb_lag_sec = max(0.0, now - meta.last_heartbeat_at)
         hb_stale = hb_lag_sec >= HEARTBEAT_STALE_SEC
-        _wid = meta.get("worker_id")
-        worker_id = int(_wid) if _wid is not None else -1
+        worker_id = meta.worker_id
         task_type = str(task.get("type") or "")
-        _att = meta.get("attempt")
-        if _att is None:
-            _att = task.get("_attempt")
-        attempt = int(_att) if _att is not None else 1
+        attempt = meta.attempt
 
-        if runtime_sec >= SOFT_TIMEOUT_SEC and not bool(meta.get("soft_sent")):
-            meta["soft_sent"] = True
+        if runtime_sec >= SOFT_TIMEOUT_SEC and not meta.soft_sent:
+            meta.soft_sent = True
             if owner_chat_id:
                 send_with_budget(
                     owner_chat_id,
@@ -308,15 +450,15 @@ def enforce_task_timeouts() -> None:
             retried["id"] = uuid.uuid4().hex[:8]
             retried["_attempt"] = attempt + 1
             retried["timeout_retry_from"] = task_id
-            retried["timeout_retry_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-            enqueue_task(retried, front=True)
+            retried["timeout_retry_at"] = iso_now()
+            enqueue_task(retried, front=True, inplace=True)
             requeued = True
             new_attempt = attempt + 1
 
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "task_hard_timeout",
                 "task_id": task_id, "task_type": task_type,
                 "worker_id": worker_id, "runtime_sec": round(runtime_sec, 2),
@@ -368,7 +510,7 @@ def queue_review_task(reason: str, force: bool = False) -> Optional[str]:
         "id": tid, "type": "review",
         "chat_id": int(owner_chat_id),
         "text": build_review_task_text(reason=reason),
-    })
+    }, inplace=True)
     persist_queue_snapshot(reason="review_enqueued")
     send_with_budget(int(owner_chat_id), f"🔎 Review queued: {tid} ({reason})")
     return tid
@@ -417,8 +559,8 @@ def enqueue_evolution_task_if_needed() -> None:
         "id": tid, "type": "evolution",
         "chat_id": int(owner_chat_id),
         "text": build_evolution_task_text(cycle),
-    })
+    }, inplace=True)
     st["evolution_cycle"] = cycle
-    st["last_evolution_task_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    st["last_evolution_task_at"] = iso_now()
     save_state(st)
     send_with_budget(int(owner_chat_id), f"🧬 Evolution #{cycle}: {tid}")
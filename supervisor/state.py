@@ -6,14 +6,17 @@ Persistent state on Google Drive: load, save, atomic writes, file locks.
 
 from __future__ import annotations
 
+import copy
 import datetime
+import itertools
 import json
 import logging
 import os
 import pathlib
+import shutil
 import time
 import uuid
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 log = logging.getLogger(__name__)
 
@@ -29,8 +32,9 @@ QUEUE_SNAPSHOT_PATH: pathlib.Path = DRIVE_ROOT / "state" / "queue_snapshot.json"
 
 
 def init(drive_root: pathlib.Path, total_budget_limit: float = 0.0) -> None:
-    global DRIVE_ROOT, STATE_PATH, STATE_LAST_GOOD_PATH, STATE_LOCK_PATH, QUEUE_SNAPSHOT_PATH
+    global DRIVE_ROOT, STATE_PATH, STATE_LAST_GOOD_PATH, STATE_LOCK_PATH, QUEUE_SNAPSHOT_PATH, _STATE_CACHE
     DRIVE_ROOT = drive_root
+    _STATE_CACHE = None
     STATE_PATH = drive_root / "state" / "state.json"
     STATE_LAST_GOOD_PATH = drive_root / "state" / "state.last_good.json"
     STATE_LOCK_PATH = drive_root / "locks" / "state.lock"
@@ -38,16 +42,37 @@ def init(drive_root: pathlib.Path, total_budget_limit: float = 0.0) -> None:
     set_budget_limit(total_budget_limit)
 
 
+# ---------------------------------------------------------------------------
+# Timestamps
+# ---------------------------------------------------------------------------
+
+# A burst of log records (timeout cascade, respawns) shares one formatted
+# timestamp instead of building and formatting a datetime per record.
+_ISO_NOW_TTL_SEC = 0.05
+_ISO_NOW_CACHE: Tuple[float, str] = (0.0, "")
+
+
+def iso_now() -> str:
+    """Current UTC time in ISO format, reused for up to 50 ms."""
+    global _ISO_NOW_CACHE
+    now = time.time()
+    cached_at, text = _ISO_NOW_CACHE
+    if 0.0 <= now - cached_at < _ISO_NOW_TTL_SEC:
+        return text
+    text = datetime.datetime.fromtimestamp(now, datetime.timezone.utc).isoformat()
+    _ISO_NOW_CACHE = (now, text)
+    return text
+
+
 # ---------------------------------------------------------------------------
 # Atomic file operations
 # ---------------------------------------------------------------------------
 
-def atomic_write_text(path: pathlib.Path, content: str) -> None:
+def atomic_write_bytes(path: pathlib.Path, data: bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_name(f".{path.name}.tmp.{uuid.uuid4().hex}")
     fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
     try:
-        data = content.encode("utf-8")
         os.write(fd, data)
         os.fsync(fd)
     finally:
@@ -55,6 +80,10 @@ def atomic_write_text(path: pathlib.Path, content: str) -> None:
     os.replace(str(tmp), str(path))
 
 
+def atomic_write_text(path: pathlib.Path, content: str) -> None:
+    atomic_write_bytes(path, content.encode("utf-8"))
+
+
 def json_load_file(path: pathlib.Path) -> Optional[Dict[str, Any]]:
     try:
         if not path.exists():
@@ -78,7 +107,7 @@ def acquire_file_lock(lock_path: pathlib.Path, timeout_sec: float = 4.0,
         try:
             fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
             try:
-                os.write(fd, f"pid={os.getpid()} ts={datetime.datetime.now(datetime.timezone.utc).isoformat()}\n".encode("utf-8"))
+                os.write(fd, f"pid={os.getpid()} ts={iso_now()}\n".encode("utf-8"))
             except Exception:
                 log.debug(f"Failed to write lock metadata to {lock_path}", exc_info=True)
                 pass
@@ -124,7 +153,7 @@ from ouroboros.utils import append_jsonl  # noqa: F401
 # ---------------------------------------------------------------------------
 
 def ensure_state_defaults(st: Dict[str, Any]) -> Dict[str, Any]:
-    st.setdefault("created_at", datetime.datetime.now(datetime.timezone.utc).isoformat())
+    st.setdefault("created_at", iso_now())
     st.setdefault("owner_id", None)
     st.setdefault("owner_chat_id", None)
     st.setdefault("tg_offset", 0)
@@ -161,8 +190,38 @@ def default_state_dict() -> Dict[str, Any]:
 # Load / Save
 # ---------------------------------------------------------------------------
 
+# Last state read or written by this process, keyed by the state file's
+# (mtime_ns, size, inode). Saves go through os.replace, so any write, from
+# this process or another, changes the key and forces a re-read.
+_STATE_CACHE: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+
+
+def _state_file_key() -> Optional[Tuple[int, int, int]]:
+    try:
+        s = STATE_PATH.stat()
+    except OSError:
+        return None
+    return s.st_mtime_ns, s.st_size, s.st_ino
+
+
+def _cached_state() -> Optional[Dict[str, Any]]:
+    cached = _STATE_CACHE
+    if cached is None or cached[0] != _state_file_key():
+        return None
+    return copy.deepcopy(cached[1])
+
+
+def _remember_state(st: Dict[str, Any]) -> None:
+    global _STATE_CACHE
+    key = _state_file_key()
+    _STATE_CACHE = (key, copy.deepcopy(st)) if key is not None else None
+
+
 def _load_state_unlocked() -> Dict[str, Any]:
     """Load state without acquiring lock. Caller must hold STATE_LOCK."""
+    cached = _cached_state()
+    if cached is not None:
+        return cached
     recovered = False
     st_obj = json_load_file(STATE_PATH)
     if st_obj is None:
@@ -177,6 +236,8 @@ def _load_state_unlocked() -> Dict[str, Any]:
     st = ensure_state_defaults(st_obj)
     if recovered:
         _save_state_unlocked(st)
+    else:
+        _remember_state(st)
     return st
 
 
@@ -186,9 +247,14 @@ def _save_state_unlocked(st: Dict[str, Any]) -> None:
     payload = json.dumps(st, ensure_ascii=False, indent=2)
     atomic_write_text(STATE_PATH, payload)
     atomic_write_text(STATE_LAST_GOOD_PATH, payload)
+    _remember_state(st)
 
 
 def load_state() -> Dict[str, Any]:
+    # Unchanged file: one stat, no lock round-trip and no JSON parse.
+    cached = _cached_state()
+    if cached is not None:
+        return cached
     lock_fd = acquire_file_lock(STATE_LOCK_PATH)
     try:
         return _load_state_unlocked()
@@ -466,16 +532,21 @@ def per_task_cost_summary(max_tasks: int = 10, tail_bytes: int = 512_000) -> Lis
 # Status text (moved from workers.py)
 # ---------------------------------------------------------------------------
 
-def status_text(workers_dict: Dict[int, Any], pending_list: list, running_dict: Dict[str, Dict[str, Any]],
+def status_text(workers_dict: Dict[int, Any], pending_list: list, running_dict: Dict[str, Any],
                 soft_timeout_sec: int, hard_timeout_sec: int) -> str:
     """Build status text from worker and queue state."""
     st = load_state()
-    now = time.time()
+    now = time.monotonic()  # RUNNING timestamps are monotonic
     lines = []
     lines.append(f"owner_id: {st.get('owner_id')}")
     lines.append(f"session_id: {st.get('session_id')}")
     lines.append(f"version: {st.get('current_branch')}@{(st.get('current_sha') or '')[:8]}")
-    busy_count = sum(1 for w in workers_dict.values() if getattr(w, 'busy_task_id', None) is not None)
+    busy = []  # one walk over workers for both the count and the preview
+    for w in workers_dict.values():
+        busy_id = getattr(w, 'busy_task_id', None)
+        if busy_id is not None:
+            busy.append(f"{getattr(w, 'wid', '?')}:{busy_id}")
+    busy_count = len(busy)
     lines.append(f"workers: {len(workers_dict)} (busy: {busy_count})")
     lines.append(f"pending: {len(pending_list)}")
     lines.append(f"running: {len(running_dict)}")
@@ -485,26 +556,20 @@ def status_text(workers_dict: Dict[int, Any], pending_list: list, running_dict:
             preview.append(
                 f"{t.get('id')}:{t.get('type')}:pr{t.get('priority')}:a{int(t.get('_attempt') or 1)}")
         lines.append("pending_queue: " + ", ".join(preview))
-    if running_dict:
-        lines.append("running_ids: " + ", ".join(list(running_dict.keys())[:10]))
-    busy = [f"{getattr(w, 'wid', '?')}:{getattr(w, 'busy_task_id', '?')}"
-            for w in workers_dict.values() if getattr(w, 'busy_task_id', None)]
+    head_running = list(itertools.islice(running_dict.items(), 10))
+    if head_running:
+        lines.append("running_ids: " + ", ".join(task_id for task_id, _ in head_running))
     if busy:
         lines.append("busy: " + ", ".join(busy))
-    if running_dict:
-        details = []
-        for task_id, meta in list(running_dict.items())[:10]:
-            task = meta.get("task") if isinstance(meta, dict) else {}
-            started = float(meta.get("started_at") or 0.0) if isinstance(meta, dict) else 0.0
-            hb = float(meta.get("last_heartbeat_at") or 0.0) if isinstance(meta, dict) else 0.0
-            runtime_sec = int(max(0.0, now - started)) if started > 0 else 0
-            hb_lag_sec = int(max(0.0, now - hb)) if hb > 0 else -1
-            details.append(
-                f"{task_id}:type={task.get('type')} pr={task.get('priority')} "
-                f"attempt={meta.get('attempt')} runtime={runtime_sec}s hb_lag={hb_lag_sec}s")
-        if details:
-            lines.append("running_details:")
-            lines.extend([f"  - {d}" for d in details])
+    if head_running:
+        lines.append("running_details:")
+        for task_id, meta in head_running:
+            task = meta.task
+            runtime_sec = int(max(0.0, now - meta.started_at))
+            hb_lag_sec = int(max(0.0, now - meta.last_heartbeat_at))
+            lines.append(
+                f"  - {task_id}:type={task.get('type')} pr={task.get('priority')} "
+                f"attempt={meta.attempt} runtime={runtime_sec}s hb_lag={hb_lag_sec}s")
     if running_dict and busy_count == 0:
         lines.append("queue_warning: running>0 while busy=0")
     spent = float(st.get("spent_usd") or 0.0)
@@ -570,12 +635,15 @@ def status_text(workers_dict: Dict[int, Any], pending_list: list, running_dict:
 def rotate_chat_log_if_needed(drive_root: pathlib.Path, max_bytes: int = 800_000) -> None:
     """Rotate chat log if it exceeds max_bytes."""
     chat = drive_root / "logs" / "chat.jsonl"
-    if not chat.exists():
+    try:
+        size = os.stat(chat).st_size
+    except FileNotFoundError:
         return
-    if chat.stat().st_size < max_bytes:
+    if size < max_bytes:
         return
     ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d_%H%M%S")
     archive_path = drive_root / "archive" / f"chat_{ts}.jsonl"
     archive_path.parent.mkdir(parents=True, exist_ok=True)
-    archive_path.write_bytes(chat.read_bytes())
-    chat.write_text("", encoding="utf-8")
+    # copyfile uses sendfile() on Linux: the log never passes through Python.
+    shutil.copyfile(chat, archive_path)
+    os.truncate(chat, 0)
@@ -6,14 +6,13 @@ TelegramClient, message splitting, markdown→HTML conversion, send_with_budget.
 
 from __future__ import annotations
 
-import datetime
 import logging
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
-from supervisor.state import load_state, save_state, append_jsonl
+from supervisor.state import load_state, save_state, append_jsonl, iso_now
 
 log = logging.getLogger(__name__)
 
@@ -408,7 +407,7 @@ def budget_line(force: bool = False) -> str:
 
 def log_chat(direction: str, chat_id: int, user_id: int, text: str) -> None:
     append_jsonl(DRIVE_ROOT / "logs" / "chat.jsonl", {
-        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "ts": iso_now(),
         "session_id": load_state().get("session_id"),
         "direction": direction,
         "chat_id": chat_id,
@@ -426,7 +425,7 @@ def send_with_budget(chat_id: int, text: str, log_text: Optional[str] = None,
     # This keeps chat history clean for context building
     if is_progress:
         append_jsonl(DRIVE_ROOT / "logs" / "progress.jsonl", {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": iso_now(),
             "direction": "out", "chat_id": chat_id, "user_id": owner_id,
             "text": text if log_text is None else log_text,
         })
@@ -451,7 +450,7 @@ def send_with_budget(chat_id: int, text: str, log_text: Optional[str] = None,
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": iso_now(),
                     "type": "telegram_send_error",
                     "chat_id": chat_id,
                     "error": err,
@@ -467,7 +466,7 @@ def send_with_budget(chat_id: int, text: str, log_text: Optional[str] = None,
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": iso_now(),
                     "type": "telegram_send_error",
                     "chat_id": chat_id,
                     "part_index": idx,
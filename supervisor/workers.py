@@ -9,11 +9,15 @@ from __future__ import annotations
 import logging
 log = logging.getLogger(__name__)
 
-import datetime
+import bisect
+import collections
+import importlib
 import json
 import multiprocessing as mp
+import multiprocessing.connection as mp_connection
 import os
 import pathlib
+import queue as _queue_mod
 import sys
 import threading
 import time
@@ -21,7 +25,7 @@ import uuid
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from supervisor.state import load_state, append_jsonl
+from supervisor.state import load_state, append_jsonl, iso_now
 from supervisor import git_ops
 from supervisor.telegram import send_with_budget
 
@@ -52,6 +56,49 @@ _WORKER_START_METHOD = str(os.environ.get("OUROBOROS_WORKER_START_METHOD", _DEFA
 if _WORKER_START_METHOD not in {"fork", "spawn", "forkserver"}:
     _WORKER_START_METHOD = _DEFAULT_WORKER_START_METHOD
 
+# Opt-in (OUROBOROS_PIN_CPUS=1): keep the supervisor on the first allowed core
+# and spread workers over the others, so CPU-bound workers can't starve the
+# timeout/heartbeat tick. Off by default: on a 2-core Colab VM it leaves all
+# workers sharing a single core.
+_PIN_CPUS = str(os.environ.get("OUROBOROS_PIN_CPUS", "") or "").strip().lower() in {"1", "true", "yes"}
+_WORKER_CPUS: Optional[Tuple[int, ...]] = None  # cores left for workers once pinned
+
+
+def _pin_supervisor_cpu() -> None:
+    global _WORKER_CPUS
+    if not _PIN_CPUS or _WORKER_CPUS is not None or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        if len(cpus) < 2:
+            return
+        os.sched_setaffinity(0, {cpus[0]})
+        _WORKER_CPUS = tuple(cpus[1:])
+    except OSError:
+        log.debug("Failed to pin supervisor CPU", exc_info=True)
+
+
+def _worker_cpu(wid: int) -> Optional[int]:
+    if not _WORKER_CPUS:
+        return None
+    return _WORKER_CPUS[wid % len(_WORKER_CPUS)]
+
+
+# Heavy third-party modules imported once in the supervisor so forked workers
+# inherit them instead of each paying the import. Third-party only: ouroboros.*
+# must stay out of supervisor memory so workers pick up self-modified code.
+_FORK_PREWARM_MODULES = ("cryptography.fernet",)
+
+
+def _prewarm_fork_imports() -> None:
+    if _WORKER_START_METHOD != "fork":
+        return
+    for name in _FORK_PREWARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            log.debug("Fork prewarm import failed: %s", name, exc_info=True)
+
 
 def _get_ctx():
     """Return multiprocessing context used for worker processes."""
@@ -89,7 +136,7 @@ def init(repo_dir: pathlib.Path, drive_root: pathlib.Path, max_workers: int,
 class Worker:
     wid: int
     proc: mp.Process
-    in_q: Any
+    in_conn: Any  # send end of a one-way Pipe; the worker holds the recv end
     busy_task_id: Optional[str] = None
 
 
@@ -104,15 +151,36 @@ def get_event_q():
     return _EVENT_Q
 
 
+def drain_events(max_messages: int = 256) -> List[Dict[str, Any]]:
+    """Take what is on EVENT_Q without blocking, flattening batched messages.
+
+    Producers may put a single event dict or a list of them. Reads stop after
+    max_messages so one tick cannot be starved by a flood; the rest waits
+    for the next call.
+    """
+    q = get_event_q()
+    events: List[Dict[str, Any]] = []
+    for _ in range(max_messages):
+        try:
+            item = q.get_nowait()
+        except _queue_mod.Empty:
+            break
+        if isinstance(item, list):
+            events.extend(item)
+        else:
+            events.append(item)
+    return events
+
+
 WORKERS: Dict[int, Worker] = {}
 PENDING: List[Dict[str, Any]] = []
-RUNNING: Dict[str, Dict[str, Any]] = {}
-CRASH_TS: List[float] = []
+RUNNING: Dict[str, RunMeta] = {}
+CRASH_TS: "collections.deque[float]" = collections.deque()  # oldest first
 QUEUE_SEQ_COUNTER_REF: Dict[str, int] = {"value": 0}
 
 # Lock for all mutations to PENDING, RUNNING, WORKERS shared collections.
 # Canonical definition lives in queue.py; imported here for use by assign_tasks/kill_workers.
-from supervisor.queue import _queue_lock
+from supervisor.queue import RunMeta, _queue_lock
 
 
 def get_running_task_ids() -> List[str]:
@@ -162,15 +230,15 @@ def handle_chat_direct(chat_id: int, text: str, image_data: Optional[Union[Tuple
         if not task["text"]:
             task["text"] = "(image attached)" if image_data else ""
         events = agent.handle_task(task)
-        for e in events:
-            get_event_q().put(e)
+        if events:
+            get_event_q().put(list(events))  # one message; drain_events flattens
     except Exception as e:
         import traceback
         err_msg = f"⚠️ Error: {type(e).__name__}: {e}"
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "direct_chat_error",
                 "error": repr(e),
                 "traceback": str(traceback.format_exc())[:2000],
@@ -258,13 +326,13 @@ def auto_resume_after_restart() -> None:
             append_jsonl(
                 DRIVE_ROOT / "logs" / "supervisor.jsonl",
                 {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "ts": iso_now(),
                     "type": "auto_resume_triggered",
                 },
             )
     except Exception as e:
         append_jsonl(DRIVE_ROOT / "logs" / "supervisor.jsonl", {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": iso_now(),
             "type": "auto_resume_error",
             "error": repr(e),
         })
@@ -274,11 +342,21 @@ def auto_resume_after_restart() -> None:
 # Worker process
 # ---------------------------------------------------------------------------
 
-def worker_main(wid: int, in_q: Any, out_q: Any, repo_dir: str, drive_root: str) -> None:
+def worker_main(wid: int, in_conn: Any, out_q: Any, repo_dir: str, drive_root: str,
+                cpu: Optional[int] = None, inherited_conns: Tuple[Any, ...] = ()) -> None:
     import sys as _sys
     import traceback as _tb
     import pathlib as _pathlib
+    # A forked worker inherits the supervisor's send ends (its own and those of
+    # workers started before it); while any copy is open, recv() never sees EOF.
+    for conn in inherited_conns:
+        conn.close()
     _sys.path.insert(0, repo_dir)
+    if cpu is not None:
+        try:
+            os.sched_setaffinity(0, {cpu})  # forked children inherit the supervisor's core
+        except OSError:
+            pass
     _drive = _pathlib.Path(drive_root)
     try:
         from ouroboros.agent import make_agent
@@ -288,14 +366,16 @@ def worker_main(wid: int, in_q: Any, out_q: Any, repo_dir: str, drive_root: str)
         return
     while True:
         try:
-            task = in_q.get()
+            try:
+                task = in_conn.recv()
+            except EOFError:
+                break  # supervisor closed its end
             if task is None or task.get("type") == "shutdown":
                 break
             events = agent.handle_task(task)
-            for e in events:
-                e2 = dict(e)
-                e2["worker_id"] = wid
-                out_q.put(e2)
+            if events:
+                # A task's result events go as one message (one lock + pickle).
+                out_q.put([dict(e, worker_id=wid) for e in events])
         except Exception as _e:
             _log_worker_crash(wid, _drive, "handle_task", _e, _tb.format_exc())
 
@@ -307,7 +387,7 @@ def _log_worker_crash(wid: int, drive_root: pathlib.Path, phase: str, exc: Excep
         path = drive_root / "logs" / "supervisor.jsonl"
         path.parent.mkdir(parents=True, exist_ok=True)
         entry = json.dumps({
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": iso_now(),
             "type": "worker_crash",
             "worker_id": wid,
             "pid": _os.getpid(),
@@ -359,16 +439,16 @@ def _verify_worker_sha_after_spawn(events_offset: int, timeout_sec: float = 90.0
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "worker_sha_verify_skipped",
                 "reason": "missing_current_sha",
             },
         )
         return
 
-    deadline = time.time() + max(float(timeout_sec), 1.0)
+    deadline = time.monotonic() + max(float(timeout_sec), 1.0)
     boot_evt = None
-    while time.time() < deadline:
+    while time.monotonic() < deadline:
         boot_evt = _first_worker_boot_event_since(events_offset)
         if boot_evt is not None:
             break
@@ -378,7 +458,7 @@ def _verify_worker_sha_after_spawn(events_offset: int, timeout_sec: float = 90.0
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "worker_sha_verify_timeout",
                 "expected_sha": expected_sha,
             },
@@ -390,7 +470,7 @@ def _verify_worker_sha_after_spawn(events_offset: int, timeout_sec: float = 90.0
     append_jsonl(
         DRIVE_ROOT / "logs" / "supervisor.jsonl",
         {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": iso_now(),
             "type": "worker_sha_verify",
             "ok": ok,
             "expected_sha": expected_sha,
@@ -410,6 +490,8 @@ def spawn_workers(n: int = 0) -> None:
     # Force fresh context to ensure workers use latest code
     _CTX = mp.get_context(_WORKER_START_METHOD)
     _EVENT_Q = _CTX.Queue()
+    _prewarm_fork_imports()
+    _pin_supervisor_cpu()
     events_path = DRIVE_ROOT / "logs" / "events.jsonl"
     try:
         events_offset = int(events_path.stat().st_size)
@@ -420,7 +502,7 @@ def spawn_workers(n: int = 0) -> None:
     append_jsonl(
         DRIVE_ROOT / "logs" / "supervisor.jsonl",
         {
-            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "ts": iso_now(),
             "type": "worker_spawn_start",
             "start_method": _WORKER_START_METHOD,
             "count": count,
@@ -428,14 +510,9 @@ def spawn_workers(n: int = 0) -> None:
     )
     WORKERS.clear()
     for i in range(count):
-        in_q = _CTX.Queue()
-        proc = _CTX.Process(target=worker_main,
-                           args=(i, in_q, _EVENT_Q, str(REPO_DIR), str(DRIVE_ROOT)))
-        proc.daemon = True
-        proc.start()
-        WORKERS[i] = Worker(wid=i, proc=proc, in_q=in_q, busy_task_id=None)
+        WORKERS[i] = _start_worker(_CTX, i, _EVENT_Q)
     global _LAST_SPAWN_TIME
-    _LAST_SPAWN_TIME = time.time()
+    _LAST_SPAWN_TIME = time.monotonic()
     # Run SHA verification in background to avoid blocking the main loop for up to 90s
     threading.Thread(target=_verify_worker_sha_after_spawn, args=(events_offset,), daemon=True).start()
 
@@ -451,41 +528,63 @@ def kill_workers() -> None:
             w.proc.join(timeout=5)
         WORKERS.clear()
         RUNNING.clear()
-    queue.persist_queue_snapshot(reason="kill_workers")
+    queue.persist_queue_snapshot(reason="kill_workers", force=True)
     if cleared_running:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "running_cleared_on_kill", "count": cleared_running,
             },
         )
 
 
-def respawn_worker(wid: int) -> None:
-    global _LAST_SPAWN_TIME
-    ctx = _get_ctx()
-    in_q = ctx.Queue()
+def _start_worker(ctx: Any, wid: int, event_q: Any) -> Worker:
+    # One producer (supervisor) and one consumer (the worker): a one-way Pipe
+    # needs no feeder thread or lock, unlike a Queue.
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    # Only fork copies the parent's descriptors; spawn/forkserver children get
+    # just their args, and passing send ends there would hand them new copies.
+    inherited: Tuple[Any, ...] = ()
+    if ctx.get_start_method() == "fork":
+        inherited = (send_conn, *(w.in_conn for w in WORKERS.values() if not w.in_conn.closed))
     proc = ctx.Process(target=worker_main,
-                       args=(wid, in_q, get_event_q(), str(REPO_DIR), str(DRIVE_ROOT)))
+                       args=(wid, recv_conn, event_q, str(REPO_DIR), str(DRIVE_ROOT),
+                             _worker_cpu(wid), inherited))
     proc.daemon = True
     proc.start()
-    WORKERS[wid] = Worker(wid=wid, proc=proc, in_q=in_q, busy_task_id=None)
+    # Drop our copy of the worker's end so a dead worker shows up as a broken
+    # pipe on send instead of a send that blocks once the buffer fills.
+    recv_conn.close()
+    return Worker(wid=wid, proc=proc, in_conn=send_conn, busy_task_id=None)
+
+
+def respawn_worker(wid: int) -> None:
+    global _LAST_SPAWN_TIME
+    WORKERS[wid] = _start_worker(_get_ctx(), wid, get_event_q())
     # Give freshly respawned workers the same init grace as startup workers.
-    _LAST_SPAWN_TIME = time.time()
+    _LAST_SPAWN_TIME = time.monotonic()
 
 
 def assign_tasks() -> None:
     from supervisor import queue
     from supervisor.state import budget_remaining, EVOLUTION_BUDGET_RESERVE
+    if not PENDING:
+        return  # common idle tick: no lock, no worker scan
     with _queue_lock:
         for w in WORKERS.values():
-            if w.busy_task_id is None and PENDING:
+            if not PENDING:
+                break
+            if w.busy_task_id is None:
                 # Find first suitable task (skip over-budget evolution tasks)
                 chosen_idx = None
+                evolution_over_budget = None  # evaluated at most once per pass
                 for i, candidate in enumerate(PENDING):
-                    if str(candidate.get("type") or "") == "evolution" and budget_remaining(load_state()) < EVOLUTION_BUDGET_RESERVE:
-                        continue
+                    if str(candidate.get("type") or "") == "evolution":
+                        if evolution_over_budget is None:
+                            evolution_over_budget = budget_remaining(load_state()) < EVOLUTION_BUDGET_RESERVE
+                        if evolution_over_budget:
+                            continue
                     chosen_idx = i
                     break
                 if chosen_idx is None:
@@ -494,14 +593,20 @@ def assign_tasks() -> None:
                     queue.persist_queue_snapshot(reason="evolution_dropped_budget")
                     continue
                 task = PENDING.pop(chosen_idx)
+                try:
+                    w.in_conn.send(task)
+                except OSError:
+                    # Worker died since the last health check; keep the task
+                    # queued and let ensure_workers_healthy respawn it.
+                    bisect.insort(PENDING, task, key=queue._queue_sort_key)
+                    continue
                 w.busy_task_id = task["id"]
-                w.in_q.put(task)
-                now_ts = time.time()
-                RUNNING[task["id"]] = {
-                    "task": dict(task), "worker_id": w.wid,
-                    "started_at": now_ts, "last_heartbeat_at": now_ts,
-                    "soft_sent": False, "attempt": int(task.get("_attempt") or 1),
-                }
+                now_ts = time.monotonic()
+                RUNNING[task["id"]] = RunMeta(
+                    task=dict(task), worker_id=w.wid,
+                    started_at=now_ts, last_heartbeat_at=now_ts,
+                    attempt=int(task.get("_attempt") or 1),
+                )
                 task_type = str(task.get("type") or "")
                 if task_type in ("evolution", "review"):
                     st = load_state()
@@ -521,34 +626,39 @@ def assign_tasks() -> None:
 def ensure_workers_healthy() -> None:
     from supervisor import queue
     # Grace period: skip health check right after spawn — workers need time to initialize
-    if (time.time() - _LAST_SPAWN_TIME) < _SPAWN_GRACE_SEC:
+    if (time.monotonic() - _LAST_SPAWN_TIME) < _SPAWN_GRACE_SEC:
         return
+    # One poll over all process sentinels instead of a waitpid per worker;
+    # a sentinel is ready only once its process has exited.
+    by_sentinel = {w.proc.sentinel: wid for wid, w in WORKERS.items()}
+    exited = mp_connection.wait(list(by_sentinel), timeout=0)
+    if not exited:
+        return  # nothing died, so the crash-storm window cannot have grown
     busy_crashes = 0
     dead_detections = 0
-    for wid, w in list(WORKERS.items()):
-        if not w.proc.is_alive():
-            dead_detections += 1
-            if w.busy_task_id is not None:
-                busy_crashes += 1
-            append_jsonl(
-                DRIVE_ROOT / "logs" / "supervisor.jsonl",
-                {
-                    "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                    "type": "worker_dead_detected",
-                    "worker_id": wid,
-                    "exitcode": w.proc.exitcode,
-                    "busy_task_id": w.busy_task_id,
-                },
-            )
-            if w.busy_task_id and w.busy_task_id in RUNNING:
-                meta = RUNNING.pop(w.busy_task_id) or {}
-                task = meta.get("task") if isinstance(meta, dict) else None
-                if isinstance(task, dict):
-                    queue.enqueue_task(task, front=True)
-            respawn_worker(wid)
-            queue.persist_queue_snapshot(reason="worker_respawn_after_crash")
-
-    now = time.time()
+    for sentinel in exited:
+        wid = by_sentinel[sentinel]
+        w = WORKERS[wid]
+        dead_detections += 1
+        if w.busy_task_id is not None:
+            busy_crashes += 1
+        append_jsonl(
+            DRIVE_ROOT / "logs" / "supervisor.jsonl",
+            {
+                "ts": iso_now(),
+                "type": "worker_dead_detected",
+                "worker_id": wid,
+                "exitcode": w.proc.exitcode,
+                "busy_task_id": w.busy_task_id,
+            },
+        )
+        if w.busy_task_id and w.busy_task_id in RUNNING:
+            meta = RUNNING.pop(w.busy_task_id)
+            queue.enqueue_task(meta.task, front=True, inplace=True)  # RUNNING no longer holds it
+        respawn_worker(wid)
+        queue.persist_queue_snapshot(reason="worker_respawn_after_crash")
+
+    now = time.monotonic()
     alive_now = sum(1 for w in WORKERS.values() if w.proc.is_alive())
     if dead_detections:
         # Count only meaningful failures:
@@ -561,7 +671,8 @@ def ensure_workers_healthy() -> None:
             # not a crash storm condition.
             CRASH_TS.clear()
 
-    CRASH_TS[:] = [t for t in CRASH_TS if (now - t) < 60.0]
+    while CRASH_TS and (now - CRASH_TS[0]) >= 60.0:
+        CRASH_TS.popleft()
     if len(CRASH_TS) >= 3:
         # Log crash storm but DON'T execv restart — that creates infinite loops.
         # Instead: kill dead workers, notify owner, continue with direct-chat (threading).
@@ -569,7 +680,7 @@ def ensure_workers_healthy() -> None:
         append_jsonl(
             DRIVE_ROOT / "logs" / "supervisor.jsonl",
             {
-                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ts": iso_now(),
                 "type": "crash_storm_detected",
                 "crash_count": len(CRASH_TS),
                 "worker_count": len(WORKERS),
@@ -0,0 +1,67 @@
+"""
+Tests for the encrypted credentials store (ouroboros/tools/credentials.py).
+
+Run: pytest tests/test_credentials.py -v
+"""
+
+import pathlib
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestCredentialsStore(unittest.TestCase):
+
+    def setUp(self):
+        from ouroboros.tools.registry import ToolContext
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self._tmpdir.name)
+        self.ctx = ToolContext(repo_dir=root, drive_root=root)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_load_missing_returns_empty(self):
+        from ouroboros.tools.credentials import _load_credentials
+        self.assertEqual(_load_credentials(self.ctx), {})
+
+    def test_load_empty_file_returns_empty(self):
+        from ouroboros.tools.credentials import _load_credentials, _get_credentials_path
+        path = _get_credentials_path(self.ctx)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+        self.assertEqual(_load_credentials(self.ctx), {})
+
+    def test_store_then_get_roundtrip(self):
+        from ouroboros.tools.credentials import _store_credentials_impl, _load_credentials
+        result = _store_credentials_impl(self.ctx, "kwork", "me@example.com", "s3cret", '{"phone": "1"}')
+        self.assertIn("✅", result)
+        creds = _load_credentials(self.ctx)
+        self.assertEqual(creds["kwork"]["password"], "s3cret")
+        self.assertEqual(creds["kwork"]["extra"], {"phone": "1"})
+
+    def test_stored_file_is_encrypted(self):
+        from ouroboros.tools.credentials import _store_credentials_impl, _get_credentials_path
+        _store_credentials_impl(self.ctx, "linkedin", "me@example.com", "s3cret")
+        raw = _get_credentials_path(self.ctx).read_bytes()
+        self.assertNotIn(b"s3cret", raw)
+
+    def test_load_cache_invalidated_by_save(self):
+        from ouroboros.tools.credentials import _store_credentials_impl, _load_credentials
+        _store_credentials_impl(self.ctx, "kwork", "a@example.com", "one")
+        first = _load_credentials(self.ctx)
+        first["kwork"]["password"] = "mutated"
+        self.assertEqual(_load_credentials(self.ctx)["kwork"]["password"], "one")
+        _store_credentials_impl(self.ctx, "kwork", "a@example.com", "two")
+        self.assertEqual(_load_credentials(self.ctx)["kwork"]["password"], "two")
+
+    def test_cipher_is_reused(self):
+        from ouroboros.tools.credentials import _get_cipher
+        self.assertIs(_get_cipher(self.ctx), _get_cipher(self.ctx))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for the Kwork tools (ouroboros/tools/kwork.py).
+
+Run: pytest tests/test_kwork.py -v
+"""
+
+import pathlib
+import sys
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class _FakePage:
+    url = "https://kwork.ru/birza?keyword=python"
+
+    def __init__(self):
+        self.evaluate_calls = 0
+
+    def locator(self, selector):
+        return mock.MagicMock()
+
+    def evaluate(self, script, arg):
+        self.evaluate_calls += 1
+        return [{
+            "title": "Python bot", "link": "/projects/1",
+            "budget": "до 5 000 ₽", "description": "Telegram bot",
+        }]
+
+
+class TestKworkSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        from ouroboros.tools import kwork
+        from ouroboros.tools.registry import ToolContext
+        kwork._SEARCH_CACHE.clear()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self._tmpdir.name)
+        self.ctx = ToolContext(repo_dir=root, drive_root=root)
+
+    def tearDown(self):
+        from ouroboros.tools import kwork
+        kwork._SEARCH_CACHE.clear()
+        self._tmpdir.cleanup()
+
+    def test_repeated_search_served_from_cache(self):
+        from ouroboros.tools import kwork
+        page = _FakePage()
+        with mock.patch("ouroboros.tools.browser._ensure_browser", return_value=page) as ensure, \
+                mock.patch.object(kwork, "_goto") as goto:
+            first = kwork._search_kwork_orders_impl(self.ctx, "Python")
+            second = kwork._search_kwork_orders_impl(self.ctx, " python ")
+        self.assertIn("Python bot", first)
+        self.assertEqual(first, second)
+        self.assertEqual(page.evaluate_calls, 1)
+        self.assertEqual(ensure.call_count, 1)
+        self.assertEqual(goto.call_count, 1)
+
+    def test_expired_entry_is_not_served(self):
+        from ouroboros.tools import kwork
+        key = ("python", 0, 15)
+        kwork._remember_search(key, "old")
+        stale = time.monotonic() - kwork._SEARCH_CACHE_TTL_SEC - 1
+        kwork._SEARCH_CACHE[key] = (stale, "old")
+        self.assertIsNone(kwork._cached_search(key))
+
+
+class TestKworkLoginPage(unittest.TestCase):
+
+    def test_login_path_detected(self):
+        from ouroboros.tools.kwork import _is_login_url
+        self.assertTrue(_is_login_url("https://kwork.ru/login"))
+        self.assertTrue(_is_login_url("https://kwork.ru/login?back=/birza"))
+
+    def test_keyword_containing_login_is_not_login_page(self):
+        from ouroboros.tools.kwork import _is_login_url
+        self.assertFalse(_is_login_url("https://kwork.ru/birza?keyword=login+form"))
+        self.assertFalse(_is_login_url("https://kwork.ru/projects/123-social-login"))
+
+
+class TestKworkLoginShortcut(unittest.TestCase):
+
+    def setUp(self):
+        from ouroboros.tools import kwork
+        from ouroboros.tools.registry import ToolContext
+        kwork._forget_login()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self._tmpdir.name)
+        self.ctx = ToolContext(repo_dir=root, drive_root=root)
+
+    def tearDown(self):
+        from ouroboros.tools import kwork
+        kwork._forget_login()
+        self._tmpdir.cleanup()
+
+    def _page(self, cookies=()):
+        page = mock.MagicMock()
+        page.url = "https://kwork.ru/birza"
+        page.context.cookies.return_value = list(cookies)
+        return page
+
+    def test_recent_login_skips_cookie_probe(self):
+        from ouroboros.tools import kwork
+        page = self._page()
+        self.ctx.browser_state.page = page
+        kwork._remember_login(page)
+        page.url = "about:blank"
+        self.assertTrue(kwork._check_kwork_logged_in(self.ctx))
+        page.context.cookies.assert_not_called()
+
+    def test_browser_teardown_drops_recent_login(self):
+        from ouroboros.tools import kwork
+        kwork._remember_login(self._page())
+        self.ctx.browser_state.page = None  # cleanup_browser
+        self.assertFalse(kwork._check_kwork_logged_in(self.ctx))
+        self.assertEqual(kwork._LAST_LOGIN_TS, 0.0)
+
+    def test_relaunched_browser_probes_cookies(self):
+        from ouroboros.tools import kwork
+        kwork._remember_login(self._page())
+        new_page = self._page()
+        new_page.url = "about:blank"
+        self.ctx.browser_state.page = new_page
+        self.assertFalse(kwork._check_kwork_logged_in(self.ctx))
+        new_page.context.cookies.assert_called_once()
+
+    def test_login_window_expires(self):
+        from ouroboros.tools import kwork
+        page = self._page()
+        page.url = "about:blank"
+        self.ctx.browser_state.page = page
+        kwork._remember_login(page)
+        kwork._LAST_LOGIN_TS = time.monotonic() - kwork._LOGIN_FRESH_SEC - 1
+        self.assertFalse(kwork._check_kwork_logged_in(self.ctx))
+
+
+if __name__ == "__main__":
+    unittest.main()
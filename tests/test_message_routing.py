@@ -86,6 +86,20 @@ class TestOwnerInjectPerTask(unittest.TestCase):
         self.assertTrue(path.exists())
         self.assertIn("persistent", path.read_text())
 
+    def test_append_handles_are_bounded(self):
+        from ouroboros import owner_inject
+        for i in range(owner_inject._MAX_HANDLES + 5):
+            owner_inject.write_owner_message(self.drive_root, f"m{i}", task_id=f"t{i}", msg_id=f"id{i}")
+        self.assertLessEqual(len(owner_inject._HANDLES), owner_inject._MAX_HANDLES)
+        self.assertEqual(owner_inject.drain_owner_messages(self.drive_root, task_id="t0"), ["m0"])
+
+    def test_write_after_cleanup_recreates_file(self):
+        from ouroboros.owner_inject import write_owner_message, cleanup_task_mailbox, drain_owner_messages
+        write_owner_message(self.drive_root, "first", task_id="t1", msg_id="m1")
+        cleanup_task_mailbox(self.drive_root, "t1")
+        write_owner_message(self.drive_root, "second", task_id="t1", msg_id="m2")
+        self.assertEqual(drain_owner_messages(self.drive_root, task_id="t1"), ["second"])
+
 
 class TestForwardToWorkerTool(unittest.TestCase):
     """Test that forward_to_worker tool is registered."""
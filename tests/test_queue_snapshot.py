@@ -0,0 +1,107 @@
+"""
+Tests for queue snapshot persistence (supervisor/queue.py).
+
+Run: pytest tests/test_queue_snapshot.py -v
+"""
+
+import json
+import pathlib
+import sys
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestQueueSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        from supervisor import queue
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self._tmpdir.name) / "queue_snapshot.json"
+        self.pending, self.running = [], {}
+        self._patches = [
+            mock.patch.object(queue, "QUEUE_SNAPSHOT_PATH", self.path),
+            mock.patch.object(queue, "_SNAPSHOT_MIN_INTERVAL_SEC", 0.3),
+        ]
+        for p in self._patches:
+            p.start()
+        queue.init_queue_refs(self.pending, self.running, {"value": 0})
+        queue._LAST_SNAPSHOT_TS = 0.0
+        queue._DEFERRED_SNAPSHOT_REASONS.clear()
+
+    def tearDown(self):
+        from supervisor import queue
+        for p in self._patches:
+            p.stop()
+        queue._DEFERRED_SNAPSHOT_REASONS.clear()
+        self._tmpdir.cleanup()
+
+    def _read(self):
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _wait_for(self, cond, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while not cond():
+            if time.monotonic() > deadline:
+                self.fail(f"condition not reached; snapshot={self._read()}")
+            time.sleep(0.01)
+
+    def test_deferred_enqueue_reaches_disk_without_another_call(self):
+        from supervisor import queue
+        queue.persist_queue_snapshot(reason="task_done")
+        self._wait_for(lambda: self._read() is not None)
+        queue.enqueue_task({"id": "new1", "type": "task", "text": "x"})
+        queue.persist_queue_snapshot(reason="schedule_task_event")
+        # No further persist call: the writer must still pick up new1.
+        self._wait_for(lambda: [r["id"] for r in (self._read() or {}).get("pending", [])] == ["new1"])
+        self.assertIn("schedule_task_event", self._read()["reason"])
+        self._wait_for(lambda: not queue._DEFERRED_SNAPSHOT_REASONS)
+
+    def test_burst_is_coalesced_to_newest_state(self):
+        from supervisor import queue
+        writes = []
+        real_write = queue.atomic_write_bytes
+
+        def counting_write(path, data):
+            writes.append(data)
+            real_write(path, data)
+
+        with mock.patch.object(queue, "atomic_write_bytes", side_effect=counting_write):
+            queue.persist_queue_snapshot(reason="startup")
+            self._wait_for(lambda: writes)
+            for i in range(20):
+                queue.enqueue_task({"id": f"t{i}", "type": "task"})
+                queue.persist_queue_snapshot(reason="main_loop")
+            self._wait_for(lambda: (self._read() or {}).get("pending_count") == 20)
+        self.assertLessEqual(len(writes), 3)
+
+    def test_force_writes_before_returning(self):
+        from supervisor import queue
+        queue.enqueue_task({"id": "keep", "type": "task"})
+        queue.persist_queue_snapshot(reason="kill_workers", force=True)
+        snap = self._read()
+        self.assertEqual([r["id"] for r in snap["pending"]], ["keep"])
+        self.assertEqual(snap["reason"], "kill_workers")
+
+    def test_exit_flush_writes_deferred_state(self):
+        from supervisor import queue
+        queue.persist_queue_snapshot(reason="startup", force=True)
+        queue.enqueue_task({"id": "late", "type": "task"})
+        # As left by a call whose payload the writer has not written yet.
+        queue._DEFERRED_SNAPSHOT_REASONS["schedule_task_event"] = None
+        queue.flush_queue_snapshot()
+        snap = self._read()
+        self.assertEqual([r["id"] for r in snap["pending"]], ["late"])
+        self.assertIn("shutdown", snap["reason"])
+        self.assertFalse(queue._DEFERRED_SNAPSHOT_REASONS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""
+Tests for web_search orchestration (ouroboros/tools/search.py).
+
+Run: pytest tests/test_search.py -v
+"""
+
+import json
+import pathlib
+import sys
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestWebSearchSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        from ouroboros.tools import search
+        from ouroboros.tools.registry import ToolContext
+        search._SEARCH_CACHE.clear()
+        search._INFLIGHT.clear()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self._tmpdir.name)
+        self.progress = []
+        self.ctx = ToolContext(repo_dir=root, drive_root=root, emit_progress_fn=self.progress.append)
+        self.calls = []
+        self.release = threading.Event()
+
+    def tearDown(self):
+        from ouroboros.tools import search
+        self.release.set()
+        search._SEARCH_CACHE.clear()
+        search._INFLIGHT.clear()
+        self._tmpdir.cleanup()
+
+    def _run(self, results, query="python asyncio"):
+        from ouroboros.tools import search
+        t = threading.Thread(target=lambda: results.append(search._web_search(self.ctx, query)))
+        t.start()
+        return t
+
+    def _wait_for(self, cond, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not cond():
+            if time.monotonic() > deadline:
+                self.fail("condition not reached")
+            time.sleep(0.005)
+
+    def test_waiter_reuses_leader_result(self):
+        from ouroboros.tools import search
+
+        def providers(ctx, query, cache_key):
+            self.calls.append(query)
+            self.release.wait(2)
+            return search._remember_search(cache_key, json.dumps({"answer": "ok"}))
+
+        results = []
+        with mock.patch.object(search, "_search_providers", side_effect=providers):
+            leader = self._run(results)
+            self._wait_for(lambda: self.calls)
+            waiter = self._run(results, query="Python   AsyncIO")
+            self._wait_for(lambda: any("already running" in p for p in self.progress))
+            self.release.set()
+            leader.join(2)
+            waiter.join(2)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(results, [json.dumps({"answer": "ok"})] * 2)
+        self.assertEqual(search._INFLIGHT, {})
+
+    def test_failed_leader_lets_waiter_retry(self):
+        from ouroboros.tools import search
+
+        def providers(ctx, query, cache_key):
+            self.calls.append(query)
+            if len(self.calls) == 1:
+                self.release.wait(2)
+                return json.dumps({"error": "all providers failed"})  # not cached
+            return search._remember_search(cache_key, json.dumps({"answer": "retry"}))
+
+        results = []
+        with mock.patch.object(search, "_search_providers", side_effect=providers):
+            leader = self._run(results)
+            self._wait_for(lambda: self.calls)
+            waiter = self._run(results)
+            self._wait_for(lambda: any("already running" in p for p in self.progress))
+            self.release.set()
+            leader.join(2)
+            waiter.join(2)
+        self.assertEqual(len(self.calls), 2)
+        self.assertIn(json.dumps({"answer": "retry"}), results)
+        self.assertEqual(search._INFLIGHT, {})
+
+    def test_waiter_gives_up_on_slow_leader(self):
+        from ouroboros.tools import search
+
+        def providers(ctx, query, cache_key):
+            self.calls.append(query)
+            if len(self.calls) == 1:
+                self.release.wait(2)
+            return json.dumps({"answer": len(self.calls)})
+
+        results = []
+        with mock.patch.object(search, "_search_providers", side_effect=providers), \
+                mock.patch.object(search, "_INFLIGHT_WAIT_SEC", 0.05):
+            leader = self._run(results)
+            self._wait_for(lambda: self.calls)
+            waiter = self._run(results)
+            waiter.join(2)
+            self.assertFalse(waiter.is_alive())
+            self.release.set()
+            leader.join(2)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(search._INFLIGHT, {})
+
+    def test_leader_exception_clears_inflight(self):
+        from ouroboros.tools import search
+        with mock.patch.object(search, "_search_providers", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                search._web_search(self.ctx, "python asyncio")
+        self.assertEqual(search._INFLIGHT, {})
+
+
+def _provider(delay, result):
+    def run():
+        time.sleep(delay)
+        return result
+    return run
+
+
+_HIT = {"result_count": 3}
+
+
+class TestRaceProviders(unittest.TestCase):
+
+    def test_preferred_provider_wins_within_grace(self):
+        from ouroboros.tools import search
+        with mock.patch.object(search, "_RACE_GRACE_SEC", 0.5):
+            best, by_name = search._race_providers([
+                ("Tavily", _provider(0.1, dict(_HIT, method="tavily"))),
+                ("DuckDuckGo", _provider(0.0, dict(_HIT, method="ddg"))),
+            ])
+        self.assertEqual(best["method"], "tavily")
+        self.assertEqual(set(by_name), {"Tavily", "DuckDuckGo"})
+
+    def test_fallback_wins_after_grace(self):
+        from ouroboros.tools import search
+        with mock.patch.object(search, "_RACE_GRACE_SEC", 0.05):
+            t0 = time.monotonic()
+            best, by_name = search._race_providers([
+                ("Tavily", _provider(1.0, dict(_HIT, method="tavily"))),
+                ("DuckDuckGo", _provider(0.0, dict(_HIT, method="ddg"))),
+            ])
+            elapsed = time.monotonic() - t0
+        self.assertEqual(best["method"], "ddg")
+        self.assertNotIn("Tavily", by_name)
+        self.assertLess(elapsed, 0.5)
+
+    def test_errors_and_empty_results_are_not_hits(self):
+        from ouroboros.tools import search
+        best, by_name = search._race_providers([
+            ("Tavily", _provider(0.0, {"error": "HTTP 500", "result_count": 5})),
+            ("DuckDuckGo", _provider(0.0, {"result_count": 0})),
+        ])
+        self.assertIsNone(best)
+        self.assertEqual(set(by_name), {"Tavily", "DuckDuckGo"})
+
+    def test_failed_preferred_provider_does_not_delay_fallback(self):
+        from ouroboros.tools import search
+        with mock.patch.object(search, "_RACE_GRACE_SEC", 5.0):
+            t0 = time.monotonic()
+            best, _ = search._race_providers([
+                ("Tavily", _provider(0.0, {"error": "no key"})),
+                ("DuckDuckGo", _provider(0.05, dict(_HIT, method="ddg"))),
+            ])
+            elapsed = time.monotonic() - t0
+        self.assertEqual(best["method"], "ddg")
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
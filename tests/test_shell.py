@@ -0,0 +1,62 @@
+"""
+Tests for shell output capture (ouroboros/tools/shell.py).
+
+Run: pytest tests/test_shell.py -v
+"""
+
+import itertools
+import string
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _legacy_output(stdout: str, stderr: str) -> str:
+    """The string-slicing behaviour _read_captured must reproduce."""
+    out = stdout + ("\n--- STDERR ---\n" + stderr if stderr else "")
+    if len(out) > 50000:
+        out = out[:25000] + "\n...(truncated)...\n" + out[-25000:]
+    return out
+
+
+def _text(n: int, alphabet: str) -> str:
+    # Non-repeating at small periods, so an off-by-one shows up in the diff.
+    return "".join(itertools.islice(itertools.cycle(alphabet + "\n"), n))
+
+
+class TestReadCaptured(unittest.TestCase):
+
+    def _captured(self, stdout: str, stderr: str) -> str:
+        from ouroboros.tools.shell import _read_captured
+        with tempfile.TemporaryFile() as out_f, tempfile.TemporaryFile() as err_f:
+            out_f.write(stdout.encode("utf-8"))
+            err_f.write(stderr.encode("utf-8"))
+            out_f.flush()
+            err_f.flush()
+            return _read_captured(out_f, err_f)
+
+    def test_matches_legacy_slicing_around_limits(self):
+        sep_len = len("\n--- STDERR ---\n")
+        out_sizes = (0, 1, 24999, 25000, 25001, 50000 - sep_len - 1, 50000 - sep_len,
+                     49999, 50000, 50001, 60000)
+        err_sizes = (0, 1, 10, 24999, 25000, 25001, 60000)
+        for out_n, err_n in itertools.product(out_sizes, err_sizes):
+            stdout = _text(out_n, string.ascii_lowercase)
+            stderr = _text(err_n, string.ascii_uppercase + string.digits)
+            with self.subTest(stdout=out_n, stderr=err_n):
+                self.assertEqual(self._captured(stdout, stderr), _legacy_output(stdout, stderr))
+
+    def test_separator_split_across_head_and_tail(self):
+        stdout = _text(24990, string.ascii_lowercase)
+        stderr = _text(30000, string.digits)
+        self.assertEqual(self._captured(stdout, stderr), _legacy_output(stdout, stderr))
+
+    def test_empty_output(self):
+        self.assertEqual(self._captured("", ""), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Tests for per-host request throttling (ouroboros/tools/_throttle.py).
+
+Run: pytest tests/test_throttle.py -v
+"""
+
+import sys
+import os
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestDomainThrottle(unittest.TestCase):
+
+    def test_first_request_does_not_wait(self):
+        from ouroboros.tools._throttle import DomainThrottle
+        throttle = DomainThrottle(rps=10)
+        self.assertEqual(throttle.acquire("example.com"), 0.0)
+
+    def test_second_request_waits_min_interval(self):
+        from ouroboros.tools._throttle import DomainThrottle
+        throttle = DomainThrottle(rps=20)
+        throttle.acquire("example.com")
+        t0 = time.monotonic()
+        throttle.acquire("example.com")
+        self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+
+    def test_hosts_are_independent(self):
+        from ouroboros.tools._throttle import DomainThrottle
+        throttle = DomainThrottle(rps=1)
+        throttle.acquire("a.example")
+        self.assertEqual(throttle.acquire("b.example"), 0.0)
+
+    def test_penalize_doubles_interval_until_expiry(self):
+        from ouroboros.tools._throttle import DomainThrottle
+        throttle = DomainThrottle(rps=10, penalty_sec=0.05, max_factor=4)
+        throttle.penalize("example.com")
+        self.assertAlmostEqual(throttle.interval("example.com"), 0.2)
+        throttle.penalize("example.com")
+        throttle.penalize("example.com")
+        self.assertAlmostEqual(throttle.interval("example.com"), 0.4)
+        time.sleep(0.06)
+        self.assertAlmostEqual(throttle.interval("example.com"), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
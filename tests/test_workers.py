@@ -0,0 +1,52 @@
+"""
+Tests for worker process plumbing (supervisor/workers.py).
+
+Run: pytest tests/test_workers.py -v
+"""
+
+import multiprocessing as mp
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _eof_worker(wid, in_conn, out_q, repo_dir, drive_root, cpu=None, inherited_conns=()):
+    """worker_main stand-in: same fd handling, reports when its pipe hits EOF."""
+    for conn in inherited_conns:
+        conn.close()
+    while True:
+        try:
+            in_conn.recv()
+        except EOFError:
+            out_q.put(wid)
+            return
+
+
+@unittest.skipUnless("fork" in mp.get_all_start_methods(), "needs the fork start method")
+class TestWorkerPipes(unittest.TestCase):
+
+    def test_closing_send_end_reaches_every_forked_worker(self):
+        from supervisor import workers
+        ctx = mp.get_context("fork")
+        event_q = ctx.Queue()
+        started = {}
+        with mock.patch.object(workers, "worker_main", _eof_worker), \
+                mock.patch.dict(workers.WORKERS, clear=True):
+            for wid in range(3):
+                started[wid] = workers.WORKERS[wid] = workers._start_worker(ctx, wid, event_q)
+        try:
+            for w in started.values():
+                w.in_conn.close()
+            self.assertEqual(sorted(event_q.get(timeout=5) for _ in started), [0, 1, 2])
+        finally:
+            for w in started.values():
+                w.proc.join(timeout=5)
+                if w.proc.is_alive():
+                    w.proc.terminate()
+
+
+if __name__ == "__main__":
+    unittest.main()